@@ -0,0 +1,363 @@
+#!/usr/bin/env python3
+"""
+Dark Web Checker - Benchmark Suite
+Author: Matteo Sala (matteo.sala@hackforce.ai)
+License: MIT
+
+Measures the throughput of the loading, checking and saving hot paths
+against a local stand-in for the Have I Been Pwned v3 API, so no API
+quota is spent.
+"""
+
+import os
+import sys
+import json
+import time
+import random
+import hashlib
+import argparse
+import logging
+import tempfile
+import threading
+import multiprocessing
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from typing import List, Dict, Any, Optional
+from urllib.parse import urlparse, parse_qs
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+class MockHIBPServer:
+    """Local HTTP stand-in for the HIBP v3 endpoints used by DarkWebChecker."""
+
+    def __init__(self, latency: float = 0.02, found_ratio: float = 0.3,
+                 breaches_per_account: int = 3, description_size: int = 500,
+                 catalog_size: int = 50, rate_limit_ratio: float = 0.0,
+                 retry_after: float = 1.0, port: int = 0):
+        """
+        Configure the mock server.
+
+        Args:
+            latency (float): Seconds each response is delayed (default: 0.02)
+            found_ratio (float): Share of accounts answered with 200 instead of 404 (default: 0.3)
+            breaches_per_account (int): Breaches returned for a breached account (default: 3)
+            description_size (int): Characters in each breach description (default: 500)
+            catalog_size (int): Number of breaches in the /breaches catalog (default: 50)
+            rate_limit_ratio (float): Share of requests answered with 429 (default: 0.0)
+            retry_after (float): Retry-After value sent with injected 429s (default: 1.0)
+            port (int): Port to listen on, 0 for any free port (default: 0)
+        """
+        self.latency = latency
+        self.found_ratio = found_ratio
+        self.breaches_per_account = min(breaches_per_account, catalog_size)
+        self.rate_limit_ratio = rate_limit_ratio
+        self.retry_after = retry_after
+        self.requests_served = 0
+        self.rate_limited = 0
+        self._counter_lock = threading.Lock()
+        self.catalog = [
+            {
+                'Name': f"Breach{i:04d}",
+                'Title': f"Breach {i}",
+                'Domain': f"breach{i}.example",
+                'BreachDate': '2020-01-01',
+                'AddedDate': f"2020-01-{1 + i % 28:02d}T00:00:00Z",
+                'ModifiedDate': '2020-02-01T00:00:00Z',
+                'PwnCount': 1000 * (i + 1),
+                'Description': 'x' * description_size,
+                'LogoPath': f"https://logos.example/Breach{i}.png",
+                'DataClasses': ['Email addresses', 'Passwords'],
+                'IsVerified': True,
+            }
+            for i in range(catalog_size)
+        ]
+        self._server = ThreadingHTTPServer(('127.0.0.1', port), self._handler_class())
+        self._server.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def base_url(self) -> str:
+        """Base URL to assign to DarkWebChecker.base_url."""
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}/api/v3"
+
+    def is_breached(self, account: str) -> bool:
+        """Deterministically decide whether an account is breached."""
+        digest = hashlib.blake2b(account.lower().encode('utf-8'), digest_size=4).digest()
+        return int.from_bytes(digest, 'little') / 2 ** 32 < self.found_ratio
+
+    def _handler_class(self):
+        """Build the request handler bound to this server's settings."""
+        mock = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def log_message(self, format, *args):
+                pass
+
+            def _send(self, status: int, payload: Any = None, headers: Optional[Dict[str, str]] = None):
+                body = json.dumps(payload).encode('utf-8') if payload is not None else b''
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(body)))
+                for name, value in (headers or {}).items():
+                    self.send_header(name, value)
+                self.end_headers()
+                self.wfile.write(body)
+
+            def do_GET(self):
+                with mock._counter_lock:
+                    mock.requests_served += 1
+                if mock.latency:
+                    time.sleep(mock.latency)
+                if mock.rate_limit_ratio and random.random() < mock.rate_limit_ratio:
+                    with mock._counter_lock:
+                        mock.rate_limited += 1
+                    self._send(429, {'statusCode': 429, 'message': 'Rate limit is exceeded.'},
+                               {'Retry-After': f"{mock.retry_after:g}"})
+                    return
+
+                url = urlparse(self.path)
+                parts = url.path.rstrip('/').split('/')
+                query = parse_qs(url.query)
+                if parts[-2:-1] == ['breachedaccount']:
+                    account = parts[-1]
+                    if not mock.is_breached(account):
+                        self._send(404)
+                        return
+                    offset = int(hashlib.md5(account.encode('utf-8')).hexdigest(), 16) % len(mock.catalog)
+                    breaches = [mock.catalog[(offset + i) % len(mock.catalog)]
+                                for i in range(mock.breaches_per_account)]
+                    if query.get('truncateResponse', ['true'])[0].lower() != 'false':
+                        breaches = [{'Name': breach['Name']} for breach in breaches]
+                    self._send(200, breaches)
+                elif parts[-1] == 'breaches':
+                    self._send(200, mock.catalog)
+                else:
+                    self._send(404)
+
+        return Handler
+
+    def start(self) -> 'MockHIBPServer':
+        """Serve requests from a background thread."""
+        self._thread = threading.Thread(target=self._server.serve_forever, name='mock-hibp', daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        """Stop serving and release the port."""
+        self._server.shutdown()
+        self._server.server_close()
+
+def peak_rss_mb() -> Optional[float]:
+    """Return the peak resident set size of this process in MB."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+def percentile(values: List[float], fraction: float) -> float:
+    """Return the nearest-rank percentile of a list of values."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(fraction * (len(ordered) - 1))))]
+
+def write_email_file(path: str, count: int, duplicate_ratio: float = 0.05):
+    """
+    Write a text input file with the given number of addresses.
+
+    Args:
+        path (str): Output path
+        count (int): Number of lines
+        duplicate_ratio (float): Share of lines repeating an earlier address (default: 0.05)
+    """
+    rng = random.Random(count)
+    with open(path, 'w', encoding='utf-8') as f:
+        for i in range(count):
+            n = rng.randrange(i) if i and rng.random() < duplicate_ratio else i
+            f.write(f"user{n}@example{n % 50}.com\n")
+
+def run_size(size: int, base_url: str, options: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Benchmark loading, checking and saving one input size.
+
+    Runs in a fresh process so that peak RSS is reported per size.
+
+    Args:
+        size (int): Number of input lines
+        base_url (str): Mock server base URL
+        options (Dict[str, Any]): Benchmark options from the command line
+
+    Returns:
+        Dict[str, Any]: Measured statistics
+    """
+    import dark_web_checker
+    logging.getLogger().setLevel(logging.WARNING)
+
+    checker = dark_web_checker.DarkWebChecker(
+        'benchmark-key', hourly_limit=0,
+        requests_per_minute=options['requests_per_minute'],
+        catalog=dark_web_checker.BreachCatalog(path=None) if options['catalog'] else None
+    )
+    checker.base_url = base_url
+
+    latencies = []
+    check_email_breach = checker.check_email_breach
+
+    def timed_check(email: str, *args, **kwargs) -> Dict[str, Any]:
+        started = time.perf_counter()
+        result = check_email_breach(email, *args, **kwargs)
+        latencies.append(time.perf_counter() - started)
+        return result
+
+    checker.check_email_breach = timed_check
+    stats: Dict[str, Any] = {'size': size}
+
+    with tempfile.TemporaryDirectory(prefix='dwc-bench-') as workdir:
+        input_path = os.path.join(workdir, 'emails.txt')
+        write_email_file(input_path, size)
+
+        started = time.perf_counter()
+        emails = checker.load_emails_from_file(input_path)
+        stats['load_seconds'] = time.perf_counter() - started
+        stats['unique_emails'] = len(emails)
+
+        if options['check_limit']:
+            emails = emails[:options['check_limit']]
+        started = time.perf_counter()
+        results = list(checker.check_many(emails, max_workers=options['workers']))
+        stats['check_seconds'] = time.perf_counter() - started
+        stats['checked'] = len(results)
+        stats['errors'] = sum(1 for result in results if result['status'] == 'error')
+        stats['emails_per_second'] = len(results) / stats['check_seconds'] if stats['check_seconds'] else 0.0
+        stats['latency_p50_ms'] = percentile(latencies, 0.50) * 1000
+        stats['latency_p99_ms'] = percentile(latencies, 0.99) * 1000
+        # Includes the pauses after injected 429s, not only the reserved spacing
+        stats['limiter_sleep_seconds'] = checker.metrics.stage_seconds('limiter_wait')
+
+        output_path = os.path.join(workdir, f"results.{options['format']}")
+        started = time.perf_counter()
+        if options['format'] in ('jsonl', 'csv'):
+            with dark_web_checker.ResultWriter(output_path) as writer:
+                for result in results:
+                    writer.write(result)
+        else:
+            checker.save_results(results, output_path)
+        stats['save_seconds'] = time.perf_counter() - started
+        stats['output_mb'] = os.path.getsize(output_path) / (1024 * 1024)
+
+    stats['peak_rss_mb'] = peak_rss_mb()
+    return stats
+
+def _run_size_in_child(queue, size: int, base_url: str, options: Dict[str, Any]):
+    """Process entry point wrapping run_size."""
+    try:
+        queue.put(run_size(size, base_url, options))
+    except Exception as e:
+        queue.put({'size': size, 'error': f"{type(e).__name__}: {e}"})
+
+def print_report(rows: List[Dict[str, Any]]):
+    """Print the benchmark results as a table."""
+    columns = [
+        ('size', 'size', 0),
+        ('load_seconds', 'load s', 2),
+        ('checked', 'checked', 0),
+        ('emails_per_second', 'emails/s', 1),
+        ('latency_p50_ms', 'p50 ms', 1),
+        ('latency_p99_ms', 'p99 ms', 1),
+        ('limiter_sleep_seconds', 'limiter s', 2),
+        ('save_seconds', 'save s', 2),
+        ('output_mb', 'out MB', 1),
+        ('peak_rss_mb', 'RSS MB', 1),
+    ]
+    print(' '.join(f"{title:>10}" for _, title, _ in columns))
+    for row in rows:
+        if 'error' in row:
+            print(f"{row['size']:>10} failed: {row['error']}")
+            continue
+        cells = []
+        for key, _, decimals in columns:
+            value = row.get(key)
+            cells.append(f"{'n/a':>10}" if value is None else f"{value:>10.{decimals}f}")
+        print(' '.join(cells))
+
+def main():
+    """Benchmark entry point."""
+    parser = argparse.ArgumentParser(
+        description="Dark Web Checker - Benchmark Suite (uses a local mock HIBP server)",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  python benchmark.py
+  python benchmark.py --sizes 1000,100000 --workers 16 --latency 0.05
+  python benchmark.py --sizes 100000 --check-limit 5000 --rate-limit-ratio 0.01 --json bench.json
+        """
+    )
+    parser.add_argument('--sizes', type=str, default='1000,100000,1000000',
+                       help='Comma-separated input sizes (default: 1000,100000,1000000)')
+    parser.add_argument('--workers', type=int, default=8, help='Concurrent requests (default: 8)')
+    parser.add_argument('--check-limit', type=int, default=0,
+                       help='Check at most this many addresses per size, 0 for all (default: 0)')
+    parser.add_argument('--requests-per-minute', type=float, default=1e9,
+                       help='Limiter rate; keep it high to measure raw throughput (default: unlimited)')
+    parser.add_argument('--latency', type=float, default=0.02, help='Mock response latency in seconds (default: 0.02)')
+    parser.add_argument('--found-ratio', type=float, default=0.3, help='Share of breached accounts (default: 0.3)')
+    parser.add_argument('--breaches-per-account', type=int, default=3,
+                       help='Breaches returned per breached account (default: 3)')
+    parser.add_argument('--description-size', type=int, default=500,
+                       help='Characters per breach description (default: 500)')
+    parser.add_argument('--rate-limit-ratio', type=float, default=0.0,
+                       help='Share of requests answered with 429 (default: 0)')
+    parser.add_argument('--retry-after', type=float, default=1.0,
+                       help='Retry-After seconds sent with injected 429s (default: 1)')
+    parser.add_argument('--format', choices=['json', 'jsonl', 'csv', 'txt'], default='jsonl',
+                       help='Output format benchmarked by the save phase (default: jsonl)')
+    parser.add_argument('--catalog', action='store_true', help='Benchmark breach catalog mode')
+    parser.add_argument('--json', type=str, default=None, metavar='PATH', help='Also write the results as JSON')
+    args = parser.parse_args()
+
+    sizes = [int(size) for size in args.sizes.split(',') if size.strip()]
+    options = {
+        'workers': args.workers,
+        'check_limit': args.check_limit,
+        'requests_per_minute': args.requests_per_minute,
+        'format': args.format,
+        'catalog': args.catalog,
+    }
+
+    server = MockHIBPServer(
+        latency=args.latency, found_ratio=args.found_ratio,
+        breaches_per_account=args.breaches_per_account, description_size=args.description_size,
+        rate_limit_ratio=args.rate_limit_ratio, retry_after=args.retry_after
+    ).start()
+    print(f"🧪 Mock HIBP server listening on {server.base_url}")
+
+    rows = []
+    context = multiprocessing.get_context('spawn')
+    try:
+        for size in sizes:
+            print(f"⏱️  Benchmarking {size} addresses...")
+            queue = context.Queue()
+            process = context.Process(target=_run_size_in_child, args=(queue, size, server.base_url, options))
+            process.start()
+            rows.append(queue.get())
+            process.join()
+    finally:
+        server.stop()
+
+    print()
+    print_report(rows)
+    print(f"\n📡 Mock server: {server.requests_served} requests, {server.rate_limited} answered with 429")
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump({'options': options, 'results': rows}, f, indent=2)
+        print(f"📄 Results saved to: {args.json}")
+
+if __name__ == "__main__":
+    main()
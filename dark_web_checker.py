@@ -9,34 +9,1749 @@ import os
 import sys
 import json
 import csv
+import gzip
 import time
 import argparse
 import logging
 import re
-from datetime import datetime, timedelta
+import hashlib
+import math
+import mmap
+import bisect
+import random
+import zlib
+import sqlite3
+import threading
+from abc import ABC, abstractmethod
+from collections import deque
+from datetime import datetime, timezone
+from itertools import chain, islice
 from pathlib import Path
-from typing import List, Dict, Any, Optional
-import requests
-from dotenv import load_dotenv
-
-# Load environment variables from .env file
-load_dotenv()
-
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler('dark_web_checker.log'),
-        logging.StreamHandler(sys.stdout)
-    ]
-)
+from urllib.parse import quote, urlencode, urlsplit
+from typing import List, Dict, Any, Optional, Iterable, Iterator, AsyncIterator, Tuple, Callable
+
 logger = logging.getLogger(__name__)
 
+class RateLimiter(ABC):
+    """
+    Base class for the pluggable request limiters.
+
+    Subclasses implement reserve(), which claims the next permitted send slot
+    and returns how long the caller has to wait for it. Slots are claimed under
+    a lock while the caller sleeps outside it, so concurrent workers are
+    released one after another instead of waking up together.
+
+    When the API pushes back, pause() holds every caller until the pause
+    ends. A caller whose slot started during the pause claims a new slot
+    after it (reclaim_if_paused), so waiters resume one spacing apart instead
+    of all firing together when the pause ends.
+    """
+
+    def __init__(self):
+        """Initialize the shared pause state."""
+        self._paused_until = 0.0
+
+    @abstractmethod
+    def reserve(self) -> float:
+        """
+        Claim the next permitted send slot.
+
+        Returns:
+            float: Seconds until the claimed slot starts
+        """
+
+    @abstractmethod
+    def next_available(self) -> float:
+        """
+        Return how long a reservation made now would wait, without claiming it.
+
+        Returns:
+            float: Seconds until the next free slot
+        """
+
+    def pause(self, seconds: float):
+        """
+        Hold all requests for the given time, e.g. after a 429 response.
+
+        Args:
+            seconds (float): Length of the pause from now
+        """
+        self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+
+    def pause_remaining(self) -> float:
+        """
+        Return how long the current pause still lasts.
+
+        Returns:
+            float: Seconds until requests may resume (0 if not paused)
+        """
+        return max(0.0, self._paused_until - time.monotonic())
+
+    def reclaim_if_paused(self) -> float:
+        """
+        Check a reserved slot that has just started against pauses begun since.
+
+        Returns:
+            float: 0 to send now, or the wait for a new slot claimed because the
+                limiter is paused
+        """
+        return self.reserve() if self.pause_remaining() > 0 else 0.0
+
+class SlidingWindowLimiter(RateLimiter):
+    """
+    Thread-safe sliding-window limiter enforcing several windows at once.
+
+    Each window keeps the send times of its last ``limit`` slots in a
+    fixed-size deque on the monotonic clock. Once the deque is full, its
+    oldest entry plus the window period is the exact earliest time the next
+    request may go out, so every reservation is O(1) per window.
+    """
+
+    def __init__(self, windows: Iterable[Tuple[int, float]]):
+        """
+        Initialize the limiter.
+
+        Args:
+            windows (Iterable[Tuple[int, float]]): (limit, period in seconds) pairs,
+                e.g. [(1, 1.6), (100, 3600)] for 1.6s spacing and 100 requests/hour
+        """
+        super().__init__()
+        self._windows = []
+        for limit, period in windows:
+            if limit < 1 or period <= 0:
+                raise ValueError(f"Invalid rate limit window: {limit} per {period}s")
+            self._windows.append((float(period), deque(maxlen=int(limit))))
+        self._last_slot = float('-inf')
+        self._lock = threading.Lock()
+
+    @classmethod
+    def for_api_key(cls, requests_per_minute: float, hourly_limit: Optional[int] = None) -> 'SlidingWindowLimiter':
+        """
+        Build the limiter used by DarkWebChecker for an API key.
+
+        Args:
+            requests_per_minute (float): Per-minute rate, enforced as even spacing
+            hourly_limit (Optional[int]): Maximum requests per rolling hour
+
+        Returns:
+            SlidingWindowLimiter: Configured limiter
+        """
+        return cls(cls.api_key_windows(requests_per_minute, hourly_limit))
+
+    @staticmethod
+    def api_key_windows(requests_per_minute: float, hourly_limit: Optional[int] = None) -> List[Tuple[int, float]]:
+        """
+        Return the (limit, period) windows enforced for an API key.
+
+        Args:
+            requests_per_minute (float): Per-minute rate, enforced as even spacing
+            hourly_limit (Optional[int]): Maximum requests per rolling hour
+
+        Returns:
+            List[Tuple[int, float]]: Limiter windows
+        """
+        windows = [(1, 60.0 / requests_per_minute)]
+        if hourly_limit:
+            windows.append((hourly_limit, 3600.0))
+        return windows
+
+    def reserve(self) -> float:
+        """
+        Claim the earliest slot permitted by every window.
+
+        Returns:
+            float: Seconds until the claimed slot starts
+        """
+        with self._lock:
+            now = time.monotonic()
+            slot = self._next_slot(now)
+            for _, history in self._windows:
+                history.append(slot)
+            self._last_slot = slot
+            return slot - now
+
+    def next_available(self) -> float:
+        """
+        Return how long until the next slot permitted by every window.
+
+        Returns:
+            float: Seconds until the next free slot
+        """
+        with self._lock:
+            now = time.monotonic()
+            return self._next_slot(now) - now
+
+    def _next_slot(self, now: float) -> float:
+        """Compute the earliest permitted slot; the caller must hold the lock."""
+        # Slots never go backwards, which keeps every deque sorted
+        slot = max(now, self._last_slot, self._paused_until)
+        for period, history in self._windows:
+            if len(history) == history.maxlen:
+                slot = max(slot, history[0] + period)
+        return slot
+
+class SharedRateLimiter(RateLimiter):
+    """
+    Sliding-window limiter whose state lives in a SQLite file shared by processes.
+    
+    Every reservation runs in an exclusive transaction, so any number of
+    processes, or hosts sharing a filesystem with working file locks, can
+    draw from one API key's budget without exceeding it together. Slots are
+    kept on the wall clock, which therefore has to be synchronized across hosts.
+    """
+    
+    def __init__(self, path: str, windows: Iterable[Tuple[int, float]], scope: str = 'default'):
+        """
+        Open (or create) the shared limiter state.
+        
+        Args:
+            path (str): SQLite file holding the state
+            windows (Iterable[Tuple[int, float]]): (limit, period in seconds) pairs
+            scope (str): Name separating independent budgets in the same file, e.g. per key
+        """
+        super().__init__()
+        self.path = path
+        self.scope = scope
+        self._windows = []
+        for limit, period in windows:
+            if limit < 1 or period <= 0:
+                raise ValueError(f"Invalid rate limit window: {limit} per {period}s")
+            self._windows.append((int(limit), float(period)))
+        self._horizon = max(period for _, period in self._windows)
+        self._lock = threading.Lock()
+        # Autocommit mode; transactions are opened explicitly with BEGIN IMMEDIATE
+        self._conn = sqlite3.connect(path, timeout=60, isolation_level=None, check_same_thread=False)
+        self._conn.execute('CREATE TABLE IF NOT EXISTS limiter_slots (scope TEXT NOT NULL, slot REAL NOT NULL)')
+        self._conn.execute('CREATE INDEX IF NOT EXISTS limiter_slots_scope ON limiter_slots (scope, slot)')
+        self._conn.execute(
+            'CREATE TABLE IF NOT EXISTS limiter_pauses (scope TEXT PRIMARY KEY, paused_until REAL NOT NULL)'
+        )
+    
+    @classmethod
+    def for_api_key(cls, path: str, requests_per_minute: float, hourly_limit: Optional[int] = None,
+                    scope: str = 'default') -> 'SharedRateLimiter':
+        """
+        Build a shared limiter with the windows DarkWebChecker uses for an API key.
+        
+        Args:
+            path (str): SQLite file holding the state
+            requests_per_minute (float): Per-minute rate, enforced as even spacing
+            hourly_limit (Optional[int]): Maximum requests per rolling hour
+            scope (str): Name of the budget within the file
+            
+        Returns:
+            SharedRateLimiter: Configured limiter
+        """
+        return cls(path, SlidingWindowLimiter.api_key_windows(requests_per_minute, hourly_limit), scope)
+    
+    def _transaction(self, write: bool):
+        """Open a transaction, taking the database write lock if requested."""
+        self._conn.execute('BEGIN IMMEDIATE' if write else 'BEGIN')
+    
+    def _next_slot(self, now: float) -> float:
+        """Compute the earliest permitted slot; must run inside a transaction."""
+        last_slot, = self._conn.execute(
+            'SELECT MAX(slot) FROM limiter_slots WHERE scope = ?', (self.scope,)
+        ).fetchone()
+        slot = max(now, last_slot or now, self._paused_until_db())
+        for limit, period in self._windows:
+            row = self._conn.execute(
+                'SELECT slot FROM limiter_slots WHERE scope = ? ORDER BY slot DESC LIMIT 1 OFFSET ?',
+                (self.scope, limit - 1)
+            ).fetchone()
+            if row is not None:
+                slot = max(slot, row[0] + period)
+        return slot
+    
+    def _paused_until_db(self) -> float:
+        """Read the shared pause deadline; must run inside a transaction."""
+        row = self._conn.execute(
+            'SELECT paused_until FROM limiter_pauses WHERE scope = ?', (self.scope,)
+        ).fetchone()
+        return row[0] if row else 0.0
+    
+    def reserve(self) -> float:
+        """
+        Claim the earliest slot permitted by every window across all processes.
+        
+        Returns:
+            float: Seconds until the claimed slot starts
+        """
+        with self._lock:
+            self._transaction(write=True)
+            try:
+                now = time.time()
+                slot = self._next_slot(now)
+                self._conn.execute('INSERT INTO limiter_slots (scope, slot) VALUES (?, ?)', (self.scope, slot))
+                self._conn.execute('DELETE FROM limiter_slots WHERE scope = ? AND slot < ?',
+                                   (self.scope, slot - self._horizon))
+                self._conn.execute('COMMIT')
+            except Exception:
+                self._conn.execute('ROLLBACK')
+                raise
+        return slot - now
+    
+    def next_available(self) -> float:
+        """
+        Return how long until the next slot permitted by every window.
+        
+        Returns:
+            float: Seconds until the next free slot
+        """
+        with self._lock:
+            self._transaction(write=False)
+            try:
+                now = time.time()
+                return self._next_slot(now) - now
+            finally:
+                self._conn.execute('COMMIT')
+    
+    def pause(self, seconds: float):
+        """
+        Hold all processes sharing this budget for the given time.
+        
+        Args:
+            seconds (float): Length of the pause from now
+        """
+        with self._lock:
+            self._conn.execute(
+                'INSERT INTO limiter_pauses (scope, paused_until) VALUES (?, ?) '
+                'ON CONFLICT(scope) DO UPDATE SET paused_until = MAX(paused_until, excluded.paused_until)',
+                (self.scope, time.time() + seconds)
+            )
+    
+    def pause_remaining(self) -> float:
+        """
+        Return how long the shared pause still lasts.
+        
+        Returns:
+            float: Seconds until requests may resume (0 if not paused)
+        """
+        with self._lock:
+            row = self._conn.execute(
+                'SELECT paused_until FROM limiter_pauses WHERE scope = ?', (self.scope,)
+            ).fetchone()
+        return max(0.0, row[0] - time.time()) if row else 0.0
+    
+    def close(self):
+        """Close the underlying database connection."""
+        with self._lock:
+            self._conn.close()
+
+class KeySlot:
+    """One API key of a KeyPool with its own session and rate limiter."""
+
+    def __init__(self, api_key: str, rate_limiter: RateLimiter, user_agent: str = 'DarkWebChecker/1.0'):
+        """
+        Initialize the key slot.
+
+        Args:
+            api_key (str): Have I Been Pwned API key
+            rate_limiter (RateLimiter): Limiter matching the key's rate tier
+            user_agent (str): User-Agent header sent with requests
+        """
+        self.api_key = api_key
+        self.rate_limiter = rate_limiter
+        self.disabled = False
+        self.user_agent = user_agent
+        self._session = None
+
+    @property
+    def session(self) -> 'requests.Session':
+        """HTTP session of the key, created on first use."""
+        if self._session is None:
+            self._session = new_session({'hibp-api-key': self.api_key, 'User-Agent': self.user_agent})
+        return self._session
+
+    @property
+    def label(self) -> str:
+        """Masked key for log messages."""
+        return f"{self.api_key[:4]}…" if len(self.api_key) > 8 else "****"
+
+class KeyPool:
+    """
+    Pool of API keys scheduled by whichever has capacity next.
+
+    Every key keeps its own session and limiter, so aggregate throughput
+    grows with the number of keys. A key answered with 401/403 is taken out
+    of rotation for good; a 429 only pauses that key's limiter, which makes
+    the scheduler prefer the other keys until the pause ends.
+    """
+
+    def __init__(self, slots: Iterable[KeySlot]):
+        """
+        Initialize the pool.
+
+        Args:
+            slots (Iterable[KeySlot]): Keys to schedule
+        """
+        self.slots = list(slots)
+        if not self.slots:
+            raise ValueError("A key pool needs at least one API key")
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_keys(cls, keys: Iterable[Tuple[str, float]], hourly_limit: Optional[int] = None,
+                  shared_state: Optional[str] = None) -> 'KeyPool':
+        """
+        Build a pool from (api_key, requests_per_minute) pairs.
+
+        Args:
+            keys (Iterable[Tuple[str, float]]): API keys with their per-minute limits
+            hourly_limit (Optional[int]): Maximum requests per rolling hour for each key
+            shared_state (Optional[str]): SQLite file to share each key's budget with other processes
+
+        Returns:
+            KeyPool: Configured pool
+        """
+        slots = []
+        for api_key, rpm in keys:
+            if shared_state:
+                scope = hashlib.sha256(api_key.encode('utf-8')).hexdigest()[:16]
+                limiter = SharedRateLimiter.for_api_key(shared_state, rpm, hourly_limit, scope=scope)
+            else:
+                limiter = SlidingWindowLimiter.for_api_key(rpm, hourly_limit)
+            slots.append(KeySlot(api_key, limiter))
+        return cls(slots)
+
+    def reserve(self) -> Tuple[KeySlot, float]:
+        """
+        Claim a send slot on the key that can send soonest.
+
+        Returns:
+            Tuple[KeySlot, float]: Chosen key and seconds until its slot starts
+
+        Raises:
+            RuntimeError: If every key has been disabled
+        """
+        with self._lock:
+            active = [slot for slot in self.slots if not slot.disabled]
+            if not active:
+                raise RuntimeError("No usable API key left in the pool")
+            slot = min(active, key=lambda candidate: candidate.rate_limiter.next_available())
+            return slot, slot.rate_limiter.reserve()
+
+    def disable(self, slot: KeySlot, reason: str):
+        """
+        Take a key out of rotation.
+
+        Args:
+            slot (KeySlot): Key to disable
+            reason (str): Why the key is disabled, for the log
+        """
+        with self._lock:
+            if not slot.disabled:
+                slot.disabled = True
+                logger.error(f"API key {slot.label} removed from the pool: {reason}")
+
+def new_session(headers: Dict[str, str]) -> 'requests.Session':
+    """
+    Create a requests session with default headers.
+    
+    requests is imported here rather than at module level: it dominates the
+    start-up time of runs that never reach the network (cache hits, offline
+    password index, merges).
+    
+    Args:
+        headers (Dict[str, str]): Headers sent with every request
+        
+    Returns:
+        requests.Session: New session
+    """
+    import requests
+    session = requests.Session()
+    session.headers.update(headers)
+    return session
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """
+    Parse a Retry-After header given either in seconds or as an HTTP date.
+    
+    Args:
+        value (Optional[str]): Header value
+        
+    Returns:
+        Optional[float]: Seconds to wait, or None if the header is missing or invalid
+    """
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    from email.utils import parsedate_to_datetime
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError, IndexError):
+        return None
+
+class RetryPolicy:
+    """
+    Retry policy for rate-limited (429) and transient API failures.
+    
+    The server's Retry-After is honored when present; otherwise the delay
+    grows exponentially with jitter. Besides the per-request limit, an
+    optional budget caps the retries of a whole run, so a long outage ends
+    in error results instead of retrying forever.
+    """
+    
+    RETRY_STATUSES = (429, 500, 502, 503, 504)
+    
+    def __init__(self, max_retries: int = 5, backoff_base: float = 2.0,
+                 backoff_max: float = 60.0, budget: Optional[int] = None):
+        """
+        Initialize the retry policy.
+        
+        Args:
+            max_retries (int): Retries allowed per request (default: 5)
+            backoff_base (float): Delay before the first retry in seconds (default: 2.0)
+            backoff_max (float): Upper bound for a single delay in seconds (default: 60.0)
+            budget (Optional[int]): Total retries allowed across all requests (default: unlimited)
+        """
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.budget = budget
+        self.retries = 0
+        self._lock = threading.Lock()
+    
+    def allow(self, attempt: int) -> bool:
+        """
+        Decide whether a failed attempt may be retried, consuming the budget if so.
+        
+        Args:
+            attempt (int): Number of retries already made for this request
+            
+        Returns:
+            bool: True if the request should be retried
+        """
+        if attempt >= self.max_retries:
+            return False
+        with self._lock:
+            if self.budget is not None and self.retries >= self.budget:
+                return False
+            self.retries += 1
+            return True
+    
+    def delay(self, attempt: int, retry_after: Optional[float] = None) -> float:
+        """
+        Compute how long to wait before the next attempt.
+        
+        Args:
+            attempt (int): Number of retries already made for this request
+            retry_after (Optional[float]): Delay requested by the server
+            
+        Returns:
+            float: Seconds to wait
+        """
+        if retry_after is not None:
+            # A little jitter keeps paused workers from retrying in lockstep
+            return retry_after + random.uniform(0, min(1.0, retry_after * 0.1))
+        ceiling = min(self.backoff_max, self.backoff_base * 2 ** attempt)
+        return random.uniform(ceiling / 2, ceiling)
+
+EMAIL_PATTERN = re.compile(r'[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}')
+
+# Bulk extraction: the lookbehind lets a match start only at the beginning of a
+# token, so long runs of non-address characters are scanned in linear time.
+# Bytes of multi-byte UTF-8 characters (\x80-\xff) count as part of the token, so
+# 'jöhn@example.com' is skipped instead of being cut down to 'hn@example.com'
+EMAIL_SCAN_PATTERN = re.compile(
+    rb'(?<![a-zA-Z0-9._%+\x80-\xff-])[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}'
+    rb'(?![a-zA-Z0-9_%+@\x80-\xff-])'
+)
+
+GMAIL_DOMAINS = ('gmail.com', 'googlemail.com')
+
+def normalize_email(email: str) -> str:
+    """
+    Normalize an email address for comparison and cache lookups.
+    
+    Args:
+        email (str): Email address as found in the input
+        
+    Returns:
+        str: Trimmed, lowercased email address
+    """
+    return email.strip().lower()
+
+def canonical_email(email: str, strip_plus: bool = False, gmail_dots: bool = False) -> str:
+    """
+    Reduce an email address to the key used to detect duplicate inputs.
+    
+    Have I Been Pwned treats these variants as different addresses, so the
+    key is only used for deduplication; the address itself is checked as found.
+    
+    Args:
+        email (str): Email address
+        strip_plus (bool): Drop a '+tag' suffix of the local part
+        gmail_dots (bool): Drop dots in the local part of Gmail addresses
+        
+    Returns:
+        str: Normalized address with the selected variations removed
+    """
+    email = normalize_email(email)
+    if not (strip_plus or gmail_dots):
+        return email
+    local, _, domain = email.rpartition('@')
+    if strip_plus:
+        local = local.split('+', 1)[0]
+    if gmail_dots and domain in GMAIL_DOMAINS:
+        local, domain = local.replace('.', ''), GMAIL_DOMAINS[0]
+    return f"{local}@{domain}"
+
+class InputProgress:
+    """Share of an input file read so far, used to estimate the ETA of streamed runs."""
+    
+    def __init__(self):
+        """Initialize an empty progress record."""
+        self.size = 0
+        self.position = 0
+    
+    @property
+    def fraction(self) -> Optional[float]:
+        """Share of the file read (0-1), or None before reading started."""
+        if not self.size or not self.position:
+            return None
+        return min(1.0, self.position / self.size)
+    
+    def track(self, lines: Iterable[str]) -> Iterator[str]:
+        """
+        Yield text lines, counting them as read (exact for ASCII files, close otherwise).
+        
+        Args:
+            lines (Iterable[str]): Lines of the input file
+            
+        Yields:
+            str: The same lines
+        """
+        for line in lines:
+            self.position += len(line)
+            yield line
+
+def shard_for_email(email: str, shard_count: int) -> int:
+    """
+    Assign an email address to a shard with jump consistent hashing.
+    
+    The assignment only depends on the normalized address, so every process
+    and host agrees on it, and changing the shard count moves as few
+    addresses as possible.
+    
+    Args:
+        email (str): Email address
+        shard_count (int): Number of shards
+        
+    Returns:
+        int: Shard index in range(shard_count)
+    """
+    key = int.from_bytes(hashlib.blake2b(normalize_email(email).encode('utf-8'), digest_size=8).digest(), 'little')
+    bucket, candidate = -1, 0
+    while candidate < shard_count:
+        bucket = candidate
+        key = (key * 2862933555777941757 + 1) & 0xFFFFFFFFFFFFFFFF
+        candidate = int((bucket + 1) * (float(1 << 31) / float((key >> 33) + 1)))
+    return bucket
+
+def parse_added_date(value: Optional[str]) -> float:
+    """
+    Parse a breach catalog timestamp such as '2013-12-04T00:00:00Z'.
+    
+    Args:
+        value (Optional[str]): AddedDate or ModifiedDate of a breach
+        
+    Returns:
+        float: Epoch seconds (0 if missing or unparseable)
+    """
+    try:
+        return datetime.strptime(value, '%Y-%m-%dT%H:%M:%SZ').replace(tzinfo=timezone.utc).timestamp()
+    except (TypeError, ValueError):
+        return 0.0
+
+def parse_duration(value: str) -> float:
+    """
+    Parse a duration such as ``90``, ``30m``, ``12h`` or ``7d`` into seconds.
+    
+    Args:
+        value (str): Number of seconds, optionally suffixed with s, m, h or d
+        
+    Returns:
+        float: Duration in seconds
+    """
+    units = {'s': 1, 'm': 60, 'h': 3600, 'd': 86400}
+    value = str(value).strip().lower()
+    try:
+        if value and value[-1] in units:
+            return float(value[:-1]) * units[value[-1]]
+        return float(value)
+    except ValueError:
+        raise ValueError(f"Invalid duration: {value!r} (use e.g. 3600, 30m, 12h, 7d)")
+
+class ResultCache:
+    """
+    Persistent SQLite cache of check results keyed by normalized email hash.
+    
+    Only definitive results ('found' and 'clean') are cached, each with its
+    own time-to-live, so errors are always retried on the next run. The
+    address itself is not stored; get() puts back the one it was asked for.
+    """
+    
+    def __init__(self, path: str, found_ttl: float = 86400, clean_ttl: float = 86400):
+        """
+        Open (or create) the cache database.
+        
+        Args:
+            path (str): Path of the SQLite database file
+            found_ttl (float): Seconds a 'found' result stays valid (default: 1 day)
+            clean_ttl (float): Seconds a 'clean' result stays valid (default: 1 day)
+        """
+        self.path = path
+        self.ttl = {'found': found_ttl, 'clean': clean_ttl}
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute('PRAGMA synchronous=NORMAL')
+        self._conn.execute(
+            'CREATE TABLE IF NOT EXISTS results ('
+            'email_hash TEXT PRIMARY KEY, status TEXT NOT NULL, '
+            'stored_at REAL NOT NULL, result TEXT NOT NULL)'
+        )
+        self._conn.commit()
+    
+    @staticmethod
+    def _key(email: str) -> str:
+        """Return the cache key for an email address."""
+        return hashlib.sha256(normalize_email(email).encode('utf-8')).hexdigest()
+    
+    def get(self, email: str) -> Optional[Dict[str, Any]]:
+        """
+        Look up a still-valid cached result.
+        
+        Args:
+            email (str): Email address to look up
+            
+        Returns:
+            Optional[Dict[str, Any]]: Cached result, or None if missing or expired
+        """
+        with self._lock:
+            row = self._conn.execute(
+                'SELECT status, stored_at, result FROM results WHERE email_hash = ?',
+                (self._key(email),)
+            ).fetchone()
+        if row is None:
+            return None
+        status, stored_at, payload = row
+        if time.time() - stored_at > self.ttl.get(status, 0):
+            return None
+        result = json.loads(payload)
+        result['email'] = email
+        result['cached'] = True
+        return result
+    
+    def put(self, result: Dict[str, Any]):
+        """
+        Store a result if it is definitive.
+        
+        Args:
+            result (Dict[str, Any]): Result returned by check_email_breach
+        """
+        if result.get('status') not in self.ttl:
+            return
+        payload = json.dumps({key: value for key, value in result.items() if key != 'email'},
+                             ensure_ascii=False)
+        with self._lock:
+            self._conn.execute(
+                'INSERT OR REPLACE INTO results (email_hash, status, stored_at, result) VALUES (?, ?, ?, ?)',
+                (self._key(result['email']), result['status'], time.time(), payload)
+            )
+            self._conn.commit()
+    
+    def close(self):
+        """Close the underlying database connection."""
+        with self._lock:
+            self._conn.close()
+
+class BreachCatalog:
+    """
+    Local copy of the HIBP breach catalog shared by all results.
+    
+    In catalog mode the API is asked for breach names only and every result
+    references breaches by name, so the metadata of each breach (description,
+    data classes, logo, ...) is held and written once instead of per email.
+    """
+    
+    def __init__(self, path: Optional[str] = 'breach_catalog.json', max_age: float = 86400):
+        """
+        Initialize the catalog, reusing the on-disk copy if there is one.
+        
+        Args:
+            path (Optional[str]): JSON file the catalog is cached in (None to keep it in memory)
+            max_age (float): Seconds before the cached catalog is downloaded again (default: 1 day)
+        """
+        self.path = path
+        self.max_age = max_age
+        self.breaches: Dict[str, Dict[str, Any]] = {}
+        self.fetched_at = 0.0
+        self._refreshed = False
+        self._lock = threading.Lock()
+        
+        if path and os.path.exists(path):
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+                self.fetched_at = float(data.get('fetched_at', 0))
+                self.breaches = {breach['Name']: breach for breach in data.get('breaches', [])}
+            except (OSError, ValueError, KeyError, TypeError) as e:
+                logger.warning(f"Ignoring unreadable breach catalog {path}: {str(e)}")
+    
+    def refresh(self, session: 'requests.Session', base_url: str):
+        """
+        Download the full breach catalog and update the on-disk copy.
+        
+        Args:
+            session (requests.Session): Session used for the request
+            base_url (str): API base URL
+        """
+        response = session.get(f"{base_url}/breaches", timeout=30)
+        response.raise_for_status()
+        self.breaches = {breach['Name']: breach for breach in response.json()}
+        self.fetched_at = time.time()
+        self._refreshed = True
+        logger.info(f"Fetched breach catalog with {len(self.breaches)} breaches")
+        
+        if self.path:
+            temp_path = f"{self.path}.tmp"
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                json.dump({'fetched_at': self.fetched_at, 'breaches': list(self.breaches.values())},
+                          f, ensure_ascii=False)
+            os.replace(temp_path, self.path)
+    
+    def ensure(self, session: 'requests.Session', base_url: str, names: Iterable[str] = ()):
+        """
+        Refresh the catalog if it is stale or lacks any of the given breaches.
+        
+        A catalog missing a breach is refreshed at most once per run, so a
+        name the API does not list cannot trigger repeated downloads.
+        
+        Args:
+            session (requests.Session): Session used for the request
+            base_url (str): API base URL
+            names (Iterable[str]): Breach names that must be resolvable
+        """
+        with self._lock:
+            if not self.is_current(names):
+                self.refresh(session, base_url)
+    
+    def is_current(self, names: Iterable[str] = ()) -> bool:
+        """
+        Check whether ensure() would leave the catalog as it is.
+        
+        Args:
+            names (Iterable[str]): Breach names that must be resolvable
+            
+        Returns:
+            bool: True if the catalog is fresh and resolves the names (or was already refreshed)
+        """
+        stale = time.time() - self.fetched_at > self.max_age
+        missing = any(name not in self.breaches for name in names)
+        return not (stale or (missing and not self._refreshed))
+    
+    def subset(self, names: Iterable[str]) -> Dict[str, Dict[str, Any]]:
+        """
+        Return the catalog entries for the given breach names.
+        
+        Args:
+            names (Iterable[str]): Breach names to include
+            
+        Returns:
+            Dict[str, Dict[str, Any]]: Breach metadata by name (unknown names map to {'Name': name})
+        """
+        return {name: self.breaches.get(name, {'Name': name}) for name in sorted(set(names))}
+
+class WatchState:
+    """
+    Compact per-email state of known breach names for watch (delta) runs.
+    
+    Addresses are stored as hashes of the normalized email, each with the
+    names of its known breaches and the time of its last check, next to the
+    newest catalog AddedDate seen by the previous run.
+    """
+    
+    def __init__(self, path: str = 'dark_web_checker_watch.db'):
+        """
+        Open (or create) the watch state database.
+        
+        Args:
+            path (str): Path of the SQLite database file
+        """
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute('PRAGMA synchronous=NORMAL')
+        self._conn.execute(
+            'CREATE TABLE IF NOT EXISTS watch_emails ('
+            'email_hash TEXT PRIMARY KEY, breaches TEXT NOT NULL, checked_at REAL NOT NULL)'
+        )
+        self._conn.execute('CREATE TABLE IF NOT EXISTS watch_meta (key TEXT PRIMARY KEY, value REAL NOT NULL)')
+        self._conn.commit()
+    
+    def get(self, email: str) -> Optional[Tuple[List[str], float]]:
+        """
+        Look up the known breaches of an address.
+        
+        Args:
+            email (str): Email address to look up
+            
+        Returns:
+            Optional[Tuple[List[str], float]]: Breach names and last check time, or None if unknown
+        """
+        with self._lock:
+            row = self._conn.execute(
+                'SELECT breaches, checked_at FROM watch_emails WHERE email_hash = ?',
+                (ResultCache._key(email),)
+            ).fetchone()
+        return (json.loads(row[0]), row[1]) if row else None
+    
+    def put(self, email: str, names: Iterable[str], checked_at: float):
+        """
+        Record the breaches of an address.
+        
+        Args:
+            email (str): Email address
+            names (Iterable[str]): Names of all breaches the address is in
+            checked_at (float): Time the breaches were current (epoch seconds)
+        """
+        payload = json.dumps(sorted(set(names)))
+        with self._lock:
+            self._conn.execute(
+                'INSERT OR REPLACE INTO watch_emails (email_hash, breaches, checked_at) VALUES (?, ?, ?)',
+                (ResultCache._key(email), payload, checked_at)
+            )
+            self._conn.commit()
+    
+    def last_added(self) -> Optional[float]:
+        """
+        Return the newest catalog AddedDate seen by the previous run.
+        
+        Returns:
+            Optional[float]: Epoch seconds, or None before the first run
+        """
+        with self._lock:
+            row = self._conn.execute("SELECT value FROM watch_meta WHERE key = 'last_added'").fetchone()
+        return row[0] if row else None
+    
+    def set_last_added(self, added_at: float):
+        """
+        Remember the newest catalog AddedDate of this run.
+        
+        Args:
+            added_at (float): Epoch seconds
+        """
+        with self._lock:
+            self._conn.execute("INSERT OR REPLACE INTO watch_meta (key, value) VALUES ('last_added', ?)",
+                               (added_at,))
+            self._conn.commit()
+    
+    def close(self):
+        """Close the underlying database connection."""
+        with self._lock:
+            self._conn.close()
+
+class BloomFilter:
+    """Fixed-size Bloom filter for memory-bounded deduplication of huge inputs."""
+    
+    def __init__(self, capacity: int, error_rate: float = 0.001):
+        """
+        Initialize the filter.
+        
+        Args:
+            capacity (int): Expected number of distinct items
+            error_rate (float): Target false-positive rate at capacity (default: 0.1%)
+        """
+        if capacity < 1 or not 0 < error_rate < 1:
+            raise ValueError("capacity must be positive and error_rate between 0 and 1")
+        self.size = max(8, int(math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2)))
+        self.hash_count = max(1, int(round(self.size / capacity * math.log(2))))
+        self._bits = bytearray((self.size + 7) // 8)
+    
+    def add(self, item: str) -> bool:
+        """
+        Add an item to the filter.
+        
+        Args:
+            item (str): Item to add
+            
+        Returns:
+            bool: True if the item was probably added before
+        """
+        digest = hashlib.blake2b(item.encode('utf-8'), digest_size=16).digest()
+        first = int.from_bytes(digest[:8], 'little')
+        step = int.from_bytes(digest[8:], 'little') | 1
+        present = True
+        for i in range(self.hash_count):
+            bit = (first + i * step) % self.size
+            mask = 1 << (bit & 7)
+            if not self._bits[bit >> 3] & mask:
+                present = False
+                self._bits[bit >> 3] |= mask
+        return present
+
+def breach_name(breach: Any) -> str:
+    """
+    Return the name of a breach stored either as a full object or a catalog reference.
+    
+    Args:
+        breach (Any): Breach dict from the API or breach name
+        
+    Returns:
+        str: Breach name
+    """
+    return breach if isinstance(breach, str) else breach.get('Name', 'Unknown')
+
+CSV_FIELDS = ['email', 'status', 'breach_count', 'checked_at']
+
+def csv_row(result: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Build the summary CSV row for a result.
+    
+    Args:
+        result (Dict[str, Any]): Result returned by check_email_breach
+        
+    Returns:
+        Dict[str, Any]: Row with the CSV_FIELDS columns
+    """
+    return {
+        'email': result['email'],
+        'status': result['status'],
+        'breach_count': result.get('breach_count', 0),
+        'checked_at': result['checked_at']
+    }
+
+def latest_results(rows: Callable[[], Iterable[Dict[str, Any]]]) -> Iterator[Dict[str, Any]]:
+    """
+    Yield only the last result of each email from a result file.
+    
+    --resume appends a new row for an address whose earlier row was an error,
+    so an output can hold several rows for one email; the last one counts.
+    The rows are read twice, first to find the last row of every normalized
+    email, so only one position per email is kept in memory.
+    
+    Args:
+        rows (Callable[[], Iterable[Dict[str, Any]]]): Opens a fresh pass over the rows
+        
+    Yields:
+        Dict[str, Any]: The last row of each email, in file order
+    """
+    last: Dict[str, int] = {}
+    for position, row in enumerate(rows()):
+        last[normalize_email(row.get('email') or '')] = position
+    for position, row in enumerate(rows()):
+        if last.get(normalize_email(row.get('email') or '')) == position:
+            yield row
+
+class ResultWriter:
+    """
+    Append-only result writer that persists every result as soon as it arrives.
+    
+    JSON-lines (.jsonl/.ndjson) and CSV outputs can be written this way; each
+    result is flushed immediately, so a crash loses at most the line being
+    written and the run can be resumed from the file. That partial line is
+    ignored on resume and cut off before new results are appended. Emails
+    whose result was an error are checked again and get a second row; read
+    such files with latest_results().
+    """
+    
+    STREAMING_EXTENSIONS = ('.jsonl', '.ndjson', '.csv')
+    
+    def __init__(self, output_file: str, append: bool = False):
+        """
+        Open the output file.
+        
+        Args:
+            output_file (str): Output file path (.jsonl, .ndjson or .csv)
+            append (bool): Keep existing results and append after them (default: False)
+        """
+        if not self.supports(output_file):
+            raise ValueError(f"Streaming output requires one of {', '.join(self.STREAMING_EXTENSIONS)}: {output_file}")
+        self.output_file = output_file
+        self.is_csv = Path(output_file).suffix.lower() == '.csv'
+        has_content = False
+        if append and os.path.exists(output_file):
+            # Drop a line cut short by a crash so it cannot end up in the results
+            complete = self._complete_length(output_file)
+            if complete < os.path.getsize(output_file):
+                with open(output_file, 'r+b') as f:
+                    f.truncate(complete)
+            has_content = complete > 0
+        
+        self._file = open(output_file, 'a' if append else 'w', newline='' if self.is_csv else None,
+                          encoding='utf-8')
+        if self.is_csv:
+            self._writer = csv.DictWriter(self._file, fieldnames=CSV_FIELDS)
+            if not has_content:
+                self._writer.writeheader()
+        self._file.flush()
+    
+    @classmethod
+    def supports(cls, output_file: str) -> bool:
+        """Return True if results can be streamed to this output file."""
+        return Path(output_file).suffix.lower() in cls.STREAMING_EXTENSIONS
+    
+    @staticmethod
+    def _complete_length(path: str) -> int:
+        """Return the length of a file up to and including its last newline."""
+        with open(path, 'rb') as f:
+            position = f.seek(0, os.SEEK_END)
+            while position > 0:
+                step = min(65536, position)
+                f.seek(position - step)
+                index = f.read(step).rfind(b'\n')
+                if index >= 0:
+                    return position - step + index + 1
+                position -= step
+        return 0
+    
+    @classmethod
+    def read_recorded_emails(cls, output_file: str) -> set:
+        """
+        Collect the emails that already have a definitive result in an output file.
+        
+        Results with status 'error' and lines truncated by a crash are ignored,
+        so those emails are checked again on resume.
+        
+        Args:
+            output_file (str): Existing .jsonl, .ndjson, .csv or .dwc output
+            
+        Returns:
+            set: Normalized email addresses to skip
+        """
+        recorded = set()
+        if not os.path.exists(output_file):
+            return recorded
+        if ColumnarWriter.supports(output_file):
+            return {normalize_email(row['email'])
+                    for row in ColumnarResults(output_file).iter_results(('found', 'clean'))}
+        
+        with open(output_file, 'r', newline='', encoding='utf-8') as f:
+            # Only a final line cut short by a crash lacks its newline
+            lines = (line for line in f if line.endswith('\n'))
+            if Path(output_file).suffix.lower() == '.csv':
+                rows = csv.DictReader(lines)
+            else:
+                rows = cls._json_lines(lines)
+            for row in rows:
+                if row.get('status') in ('found', 'clean') and row.get('email'):
+                    recorded.add(normalize_email(row['email']))
+        return recorded
+    
+    @staticmethod
+    def _json_lines(f) -> Iterator[Dict[str, Any]]:
+        """Yield the JSON objects of a JSON-lines file, skipping damaged lines."""
+        for line in f:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue
+            if isinstance(record, dict):
+                yield record
+    
+    def write(self, result: Dict[str, Any]):
+        """
+        Append a result and flush it to disk.
+        
+        Args:
+            result (Dict[str, Any]): Result returned by check_email_breach
+        """
+        if self.is_csv:
+            self._writer.writerow(csv_row(result))
+        else:
+            self._file.write(json.dumps(result, ensure_ascii=False) + '\n')
+        self._file.flush()
+    
+    def close(self):
+        """Flush the file to stable storage and close it."""
+        if not self._file.closed:
+            self._file.flush()
+            os.fsync(self._file.fileno())
+            self._file.close()
+    
+    def __enter__(self) -> 'ResultWriter':
+        return self
+    
+    def __exit__(self, *exc_info):
+        self.close()
+
+class ColumnarWriter:
+    """
+    Streaming writer for the compact '.dwc' result layout.
+    
+    A '.dwc' output is a directory with two tables and a catalog:
+    
+    - results: one row per email with status, breach_count, checked_at
+      (and error), without any breach details
+    - breaches: one (email, breach) edge per breach of each email, the breach
+      name being the key into the catalog
+    - catalog.json: the metadata of every referenced breach, stored once
+    
+    Tables are gzip-compressed JSON lines written in blocks of FLUSH_EVERY
+    rows, each block a complete gzip member, so a crash loses at most the
+    last block and the output can be resumed. With table_format 'parquet'
+    the tables are Parquet files instead (requires the optional pyarrow
+    package). Parquet files only get their footer on close(), so they cannot
+    be appended to and a run that does not end cleanly leaves them unreadable.
+    """
+    
+    EXTENSION = '.dwc'
+    FORMATS = ('jsonl', 'parquet')
+    FLUSH_EVERY = 1000
+    RESULT_COLUMNS = ('email', 'status', 'breach_count', 'checked_at', 'error')
+    
+    def __init__(self, path: str, append: bool = False, table_format: str = 'jsonl',
+                 resolve_breaches: Optional[Callable[[Iterable[str]], Dict[str, Dict[str, Any]]]] = None):
+        """
+        Create (or reopen) the output directory.
+        
+        Args:
+            path (str): Output directory, ending in '.dwc'
+            append (bool): Keep existing results and append after them (default: False)
+            table_format (str): 'jsonl' (gzip-compressed JSON lines) or 'parquet'
+            resolve_breaches (Optional[Callable]): Looks up catalog metadata for breach names;
+                needed when results reference breaches by name (catalog mode)
+        """
+        if table_format not in self.FORMATS:
+            raise ValueError(f"Unknown table format {table_format!r}, expected one of {', '.join(self.FORMATS)}")
+        if table_format == 'parquet' and append:
+            raise ValueError("Parquet tables cannot be appended to; use the jsonl table format to resume")
+        self.path = path
+        self.table_format = table_format
+        self._resolve = resolve_breaches
+        self._rows: List[Dict[str, Any]] = []
+        self._edges: List[Tuple[str, str]] = []
+        self.catalog: Dict[str, Dict[str, Any]] = {}
+        self._names = set()
+        self._catalog_size = 0
+        self._closed = False
+        os.makedirs(path, exist_ok=True)
+        
+        if table_format == 'parquet':
+            try:
+                import pyarrow
+                import pyarrow.parquet
+            except ImportError:
+                raise ValueError("Parquet output requires the optional pyarrow package (pip install pyarrow)")
+            self._pyarrow = pyarrow
+            self._results_writer = pyarrow.parquet.ParquetWriter(
+                os.path.join(path, 'results.parquet'),
+                pyarrow.schema([('email', pyarrow.string()), ('status', pyarrow.string()),
+                                ('breach_count', pyarrow.int32()), ('checked_at', pyarrow.string()),
+                                ('error', pyarrow.string())]))
+            self._edges_writer = pyarrow.parquet.ParquetWriter(
+                os.path.join(path, 'breaches.parquet'),
+                pyarrow.schema([('email', pyarrow.string()), ('breach', pyarrow.string())]))
+            return
+        
+        results_path = os.path.join(path, 'results.jsonl.gz')
+        edges_path = os.path.join(path, 'breaches.jsonl.gz')
+        if append:
+            existing = ColumnarResults(path)
+            self.catalog = existing.catalog
+            self._names = {breach for _, breach in existing.iter_edges()}
+            self._catalog_size = len(self._names)
+            # Drop a block cut short by a crash so new blocks stay readable
+            for table_path in (results_path, edges_path):
+                if os.path.exists(table_path):
+                    with open(table_path, 'r+b') as f:
+                        f.truncate(self._complete_gzip_length(table_path))
+        self._results_file = open(results_path, 'ab' if append else 'wb')
+        self._edges_file = open(edges_path, 'ab' if append else 'wb')
+    
+    @classmethod
+    def supports(cls, output_file: str) -> bool:
+        """Return True if the output path selects the columnar layout."""
+        return Path(output_file.rstrip('/\\')).suffix.lower() == cls.EXTENSION
+    
+    @classmethod
+    def _complete_gzip_length(cls, path: str) -> int:
+        """Return the length of the leading complete gzip members of a file."""
+        complete = 0
+        for complete, _ in cls._gzip_members(path):
+            pass
+        return complete
+    
+    @staticmethod
+    def _gzip_members(path: str) -> Iterator[Tuple[int, bytes]]:
+        """
+        Decompress the leading complete gzip members (blocks) of a file.
+        
+        A block whose end was cut off by a crash still decompresses partially;
+        it and anything after it are skipped, exactly what an append truncates.
+        
+        Yields:
+            Tuple[int, bytes]: File offset of the end of each block and its contents
+        """
+        position = 0
+        decompressor = zlib.decompressobj(31)
+        parts = []
+        with open(path, 'rb') as f:
+            for chunk in iter(lambda: f.read(1 << 20), b''):
+                while chunk:
+                    try:
+                        parts.append(decompressor.decompress(chunk))
+                    except zlib.error:
+                        return
+                    if not decompressor.eof:
+                        position += len(chunk)
+                        break
+                    position += len(chunk) - len(decompressor.unused_data)
+                    yield position, b''.join(parts)
+                    parts = []
+                    chunk = decompressor.unused_data
+                    decompressor = zlib.decompressobj(31)
+    
+    def write(self, result: Dict[str, Any]):
+        """
+        Add a result, writing a block once FLUSH_EVERY rows are buffered.
+        
+        Args:
+            result (Dict[str, Any]): Result returned by check_email_breach
+        """
+        self._rows.append({column: result.get(column) for column in self.RESULT_COLUMNS})
+        for breach in result.get('breaches') or []:
+            name = breach_name(breach)
+            if isinstance(breach, dict) and name not in self.catalog:
+                self.catalog[name] = breach
+            self._names.add(name)
+            self._edges.append((result['email'], name))
+        if len(self._rows) >= self.FLUSH_EVERY:
+            self.flush()
+    
+    def flush(self):
+        """Write the buffered rows as one block of each table."""
+        if not self._rows:
+            return
+        if self.table_format == 'parquet':
+            columns = {column: [row[column] for row in self._rows] for column in self.RESULT_COLUMNS}
+            self._results_writer.write_table(self._pyarrow.table(columns, schema=self._results_writer.schema))
+            if self._edges:
+                emails, breaches = zip(*self._edges)
+                self._edges_writer.write_table(self._pyarrow.table(
+                    {'email': list(emails), 'breach': list(breaches)}, schema=self._edges_writer.schema))
+        else:
+            # Edges first: a crash in between leaves results to re-check rather than results without edges
+            edges = ''.join(json.dumps({'email': email, 'breach': breach}, ensure_ascii=False) + '\n'
+                            for email, breach in self._edges)
+            rows = ''.join(json.dumps({key: value for key, value in row.items() if value is not None},
+                                      ensure_ascii=False) + '\n' for row in self._rows)
+            for f, text in ((self._edges_file, edges), (self._results_file, rows)):
+                if text:
+                    f.write(gzip.compress(text.encode('utf-8')))
+                    f.flush()
+        self._rows, self._edges = [], []
+        if len(self._names) != self._catalog_size:
+            # Keep the catalog in step with the tables in case the run is interrupted
+            self._write_catalog(resolve=False)
+    
+    def _write_catalog(self, resolve: bool = True):
+        """Atomically write the metadata of every referenced breach."""
+        missing = [name for name in self._names if name not in self.catalog]
+        if missing and resolve and self._resolve is not None:
+            self.catalog.update(self._resolve(missing))
+        catalog = {name: self.catalog.get(name, {'Name': name}) for name in sorted(self._names)}
+        temp_path = os.path.join(self.path, 'catalog.json.tmp')
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(catalog, f, ensure_ascii=False)
+        os.replace(temp_path, os.path.join(self.path, 'catalog.json'))
+        self._catalog_size = len(self._names)
+    
+    def close(self):
+        """Write the remaining rows and the catalog of all referenced breaches."""
+        if self._closed:
+            return
+        self._closed = True
+        self.flush()
+        if self.table_format == 'parquet':
+            self._results_writer.close()
+            self._edges_writer.close()
+        else:
+            for f in (self._results_file, self._edges_file):
+                os.fsync(f.fileno())
+                f.close()
+        self._write_catalog()
+    
+    def __enter__(self) -> 'ColumnarWriter':
+        return self
+    
+    def __exit__(self, *exc_info):
+        self.close()
+
+class ColumnarResults:
+    """
+    Read-only access to a '.dwc' result directory written by ColumnarWriter.
+    
+    Tables are streamed row by row (or batch by batch for Parquet), so
+    reports can count statuses or look up a breach without loading, or even
+    parsing, the other table.
+    """
+    
+    def __init__(self, path: str):
+        """
+        Open a result directory.
+        
+        Args:
+            path (str): Directory written by ColumnarWriter
+        """
+        self.path = path
+        self._catalog: Optional[Dict[str, Dict[str, Any]]] = None
+    
+    @property
+    def catalog(self) -> Dict[str, Dict[str, Any]]:
+        """Breach metadata by name for every breach referenced by the results."""
+        if self._catalog is None:
+            catalog_path = os.path.join(self.path, 'catalog.json')
+            self._catalog = {}
+            if os.path.exists(catalog_path):
+                with open(catalog_path, 'r', encoding='utf-8') as f:
+                    self._catalog = json.load(f)
+        return self._catalog
+    
+    def _table(self, name: str) -> Iterator[Dict[str, Any]]:
+        """Stream the rows of a table in whichever format it was written."""
+        parquet_path = os.path.join(self.path, f'{name}.parquet')
+        if os.path.exists(parquet_path):
+            import pyarrow
+            import pyarrow.parquet
+            try:
+                table = pyarrow.parquet.ParquetFile(parquet_path)
+            except pyarrow.ArrowInvalid:
+                raise ValueError(f"Incomplete Parquet table {parquet_path}: the run writing it did not "
+                                 f"end cleanly (use the jsonl table format for crash-safe output)")
+            for batch in table.iter_batches():
+                # Drop the nulls of absent fields so rows match the JSON-lines tables
+                for row in batch.to_pylist():
+                    yield {key: value for key, value in row.items() if value is not None}
+            return
+        
+        jsonl_path = os.path.join(self.path, f'{name}.jsonl.gz')
+        if not os.path.exists(jsonl_path):
+            return
+        # Rows of a block cut short by a crash are left out, as resuming drops that block
+        for _, block in ColumnarWriter._gzip_members(jsonl_path):
+            yield from ResultWriter._json_lines(block.decode('utf-8').splitlines())
+    
+    def iter_results(self, statuses: Optional[Iterable[str]] = None) -> Iterator[Dict[str, Any]]:
+        """
+        Stream the results table.
+        
+        Args:
+            statuses (Optional[Iterable[str]]): Only yield results with these statuses
+            
+        Only the last row of an email re-checked by --resume is yielded.
+        
+        Yields:
+            Dict[str, Any]: email, status, breach_count, checked_at (and error)
+        """
+        statuses = set(statuses) if statuses is not None else None
+        for row in latest_results(lambda: self._table('results')):
+            if statuses is None or row.get('status') in statuses:
+                yield row
+    
+    def iter_edges(self, breaches: Optional[Iterable[str]] = None) -> Iterator[Tuple[str, str]]:
+        """
+        Stream the email×breach table.
+        
+        Args:
+            breaches (Optional[Iterable[str]]): Only yield edges of these breach names
+            
+        Yields:
+            Tuple[str, str]: (email, breach name) pairs
+        """
+        breaches = set(breaches) if breaches is not None else None
+        # A block of edges whose results were lost to a crash is written again on resume
+        seen = set()
+        for row in self._table('breaches'):
+            if breaches is None or row.get('breach') in breaches:
+                edge = (normalize_email(row['email']), row['breach'])
+                if edge not in seen:
+                    seen.add(edge)
+                    yield row['email'], row['breach']
+    
+    def emails_in_breach(self, name: str) -> List[str]:
+        """
+        Return the emails found in a breach.
+        
+        Args:
+            name (str): Breach name
+            
+        Returns:
+            List[str]: Email addresses
+        """
+        return [email for email, _ in self.iter_edges([name])]
+    
+    def breach_counts(self) -> Dict[str, int]:
+        """
+        Count the emails found in each breach.
+        
+        Returns:
+            Dict[str, int]: Number of emails by breach name, most affected first
+        """
+        counts: Dict[str, int] = {}
+        for _, breach in self.iter_edges():
+            counts[breach] = counts.get(breach, 0) + 1
+        return dict(sorted(counts.items(), key=lambda item: -item[1]))
+    
+    def status_counts(self) -> Dict[str, int]:
+        """
+        Count the results per status.
+        
+        Returns:
+            Dict[str, int]: Number of results by status
+        """
+        counts: Dict[str, int] = {}
+        for row in self.iter_results():
+            counts[row['status']] = counts.get(row['status'], 0) + 1
+        return counts
+
+class RunMetrics:
+    """
+    Thread-safe counters and latency histograms describing a check run.
+    
+    Timed stages are 'limiter_wait' (time blocked in the rate limiter),
+    'request' (network round trip of one API call), 'parse' (decoding the
+    JSON response) and 'write' (writing one result). Stage times are summed
+    over all workers, so with several workers they can exceed the wall time.
+    """
+    
+    BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+    STAGES = ('limiter_wait', 'request', 'parse', 'write')
+    COUNTERS = ('retries', 'network_errors', 'cache_hits', 'keys_disabled')
+    
+    def __init__(self):
+        """Start the run clock with all counters at zero."""
+        self.started = time.monotonic()
+        self._lock = threading.Lock()
+        self.results: Dict[str, int] = {}
+        self.responses: Dict[int, int] = {}
+        self.counters = dict.fromkeys(self.COUNTERS, 0)
+        # Per stage: non-cumulative bucket counts (last one is +Inf), sum and count
+        self._buckets = {stage: [0] * (len(self.BUCKETS) + 1) for stage in self.STAGES}
+        self._sums = dict.fromkeys(self.STAGES, 0.0)
+        self._counts = dict.fromkeys(self.STAGES, 0)
+    
+    def observe(self, stage: str, seconds: float):
+        """
+        Record the duration of one pass through a stage.
+        
+        Args:
+            stage (str): One of STAGES
+            seconds (float): Duration
+        """
+        index = bisect.bisect_left(self.BUCKETS, seconds)
+        with self._lock:
+            self._buckets[stage][index] += 1
+            self._sums[stage] += seconds
+            self._counts[stage] += 1
+    
+    def count(self, counter: str, amount: int = 1):
+        """
+        Increment one of the event counters.
+        
+        Args:
+            counter (str): One of COUNTERS
+            amount (int): Increment
+        """
+        with self._lock:
+            self.counters[counter] += amount
+    
+    def count_response(self, status_code: int):
+        """
+        Count an HTTP response by status code.
+        
+        Args:
+            status_code (int): HTTP status code
+        """
+        with self._lock:
+            self.responses[status_code] = self.responses.get(status_code, 0) + 1
+    
+    def count_result(self, result: Dict[str, Any]):
+        """
+        Count a finished check by status.
+        
+        Args:
+            result (Dict[str, Any]): Result returned by check_email_breach
+        """
+        with self._lock:
+            self.results[result['status']] = self.results.get(result['status'], 0) + 1
+            if result.get('cached'):
+                self.counters['cache_hits'] += 1
+    
+    def elapsed(self) -> float:
+        """Return the seconds since the run started."""
+        return time.monotonic() - self.started
+    
+    def stage_seconds(self, stage: str) -> float:
+        """Return the total time spent in a stage."""
+        return self._sums[stage]
+    
+    def quantile(self, stage: str, q: float) -> Optional[float]:
+        """
+        Estimate a quantile of a stage's durations from its histogram.
+        
+        Args:
+            stage (str): One of STAGES
+            q (float): Quantile between 0 and 1
+            
+        Returns:
+            Optional[float]: Upper bound of the bucket holding the quantile
+                (None without observations, inf beyond the last bucket)
+        """
+        with self._lock:
+            buckets, total = list(self._buckets[stage]), self._counts[stage]
+        if not total:
+            return None
+        rank, seen = q * total, 0
+        for bound, observed in zip(self.BUCKETS + (math.inf,), buckets):
+            seen += observed
+            if seen >= rank:
+                return bound
+        return math.inf
+    
+    def progress_line(self, done: int, total: Optional[int] = None,
+                      input_fraction: Optional[float] = None) -> str:
+        """
+        Format a progress line with throughput, ETA and where the time went.
+        
+        Args:
+            done (int): Results finished so far
+            total (Optional[int]): Expected number of results, if known
+            input_fraction (Optional[float]): Share of a streamed input read so far; when
+                total is unknown, the total is estimated from it (shown as '~N')
+            
+        Returns:
+            str: Progress line
+        """
+        elapsed = self.elapsed()
+        rate = done / elapsed if elapsed > 0 else 0.0
+        estimated = False
+        if not total and input_fraction and done:
+            # Addresses are spread evenly enough through input files for a linear estimate
+            total, estimated = max(done, round(done / input_fraction)), True
+        line = f"⏱️  {done}/{'~' if estimated else ''}{total}" if total else f"⏱️  {done}"
+        line += f" checked in {format_seconds(elapsed)} ({rate * 60:.1f}/min"
+        if total and rate > 0:
+            line += f", ETA {format_seconds((total - done) / rate)}"
+        line += f") | limiter {format_seconds(self.stage_seconds('limiter_wait'))}, " \
+                f"network {format_seconds(self.stage_seconds('request'))}"
+        throttled = self.responses.get(429, 0)
+        if throttled:
+            line += f" | 429s: {throttled}"
+        return line
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Return a JSON-serializable snapshot of all metrics.
+        
+        Returns:
+            Dict[str, Any]: Counters, per-stage totals and latency percentiles
+        """
+        with self._lock:
+            snapshot = {
+                'elapsed_seconds': round(self.elapsed(), 3),
+                'results': dict(self.results),
+                'responses': {str(code): count for code, count in sorted(self.responses.items())},
+                'counters': dict(self.counters),
+            }
+        snapshot['stages'] = {
+            stage: {
+                'count': self._counts[stage],
+                'total_seconds': round(self._sums[stage], 3),
+                'p50_seconds': self.quantile(stage, 0.5),
+                'p95_seconds': self.quantile(stage, 0.95),
+                'p99_seconds': self.quantile(stage, 0.99),
+            }
+            for stage in self.STAGES
+        }
+        return snapshot
+    
+    def prometheus_text(self) -> str:
+        """
+        Render the metrics in the Prometheus text exposition format.
+        
+        Returns:
+            str: Metrics text
+        """
+        lines = ['# TYPE dwc_run_duration_seconds gauge',
+                 f'dwc_run_duration_seconds {self.elapsed():.3f}',
+                 '# TYPE dwc_results_total counter']
+        with self._lock:
+            lines += [f'dwc_results_total{{status="{status}"}} {count}'
+                      for status, count in sorted(self.results.items())]
+            lines.append('# TYPE dwc_http_responses_total counter')
+            lines += [f'dwc_http_responses_total{{code="{code}"}} {count}'
+                      for code, count in sorted(self.responses.items())]
+            for counter, count in self.counters.items():
+                lines += [f'# TYPE dwc_{counter}_total counter', f'dwc_{counter}_total {count}']
+            lines.append('# TYPE dwc_stage_seconds histogram')
+            for stage in self.STAGES:
+                cumulative = 0
+                for bound, observed in zip(self.BUCKETS + (math.inf,), self._buckets[stage]):
+                    cumulative += observed
+                    le = '+Inf' if bound == math.inf else f'{bound:g}'
+                    lines.append(f'dwc_stage_seconds_bucket{{stage="{stage}",le="{le}"}} {cumulative}')
+                lines.append(f'dwc_stage_seconds_sum{{stage="{stage}"}} {self._sums[stage]:.6f}')
+                lines.append(f'dwc_stage_seconds_count{{stage="{stage}"}} {self._counts[stage]}')
+        return '\n'.join(lines) + '\n'
+    
+    def write_prometheus(self, path: str):
+        """
+        Atomically replace a Prometheus text file (e.g. for the node_exporter textfile collector).
+        
+        Args:
+            path (str): Metrics file path
+        """
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write(self.prometheus_text())
+        os.replace(tmp_path, path)
+    
+    def write_json(self, path: str):
+        """
+        Write the metrics snapshot as JSON.
+        
+        Args:
+            path (str): Stats file path
+        """
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.to_dict(), f, indent=2)
+
+def format_seconds(seconds: float) -> str:
+    """
+    Format a duration compactly, e.g. '42.0s', '3m12s' or '2h05m'.
+    
+    Args:
+        seconds (float): Duration
+        
+    Returns:
+        str: Formatted duration
+    """
+    if seconds < 60:
+        return f"{seconds:.1f}s"
+    minutes, secs = divmod(int(seconds), 60)
+    if minutes < 60:
+        return f"{minutes}m{secs:02d}s"
+    hours, minutes = divmod(minutes, 60)
+    return f"{hours}h{minutes:02d}m"
+
 class DarkWebChecker:
     """Main class for checking email addresses against data breaches."""
     
-    def __init__(self, api_key: str, hourly_limit: int = 100, request_delay: float = 1.6):
+    def __init__(self, api_key: str, hourly_limit: int = 100, request_delay: float = 1.6,
+                 requests_per_minute: Optional[float] = None,
+                 rate_limiter: Optional[RateLimiter] = None,
+                 cache: Optional[ResultCache] = None,
+                 catalog: Optional[BreachCatalog] = None,
+                 retry_policy: Optional[RetryPolicy] = None,
+                 key_pool: Optional[KeyPool] = None,
+                 metrics: Optional[RunMetrics] = None):
         """
         Initialize the Dark Web Checker.
         
@@ -44,20 +1759,45 @@ class DarkWebChecker:
             api_key (str): Have I Been Pwned API key
             hourly_limit (int): Maximum requests per hour (default: 100)
             request_delay (float): Delay between requests in seconds (default: 1.6)
+            requests_per_minute (Optional[float]): Per-minute ceiling of the API key;
+                overrides request_delay when set
+            rate_limiter (Optional[RateLimiter]): Limiter shared by all checks; defaults to
+                a SlidingWindowLimiter built from the per-minute and hourly limits
+            cache (Optional[ResultCache]): Persistent result cache consulted before the API
+            catalog (Optional[BreachCatalog]): Enables catalog mode, where results list breach
+                names that reference this shared catalog instead of full breach objects
+            retry_policy (Optional[RetryPolicy]): Retry behavior for 429, 5xx and network
+                errors (default: RetryPolicy())
+            key_pool (Optional[KeyPool]): Several API keys to spread requests over; replaces
+                api_key and rate_limiter for API requests when set
+            metrics (Optional[RunMetrics]): Collects timings and counters (default: RunMetrics())
         """
         self.api_key = api_key
         self.base_url = "https://haveibeenpwned.com/api/v3"
         self.hourly_limit = hourly_limit
         self.request_delay = request_delay
-        self.request_history = []  # Track request timestamps
+        self.requests_per_minute = requests_per_minute or 60.0 / request_delay
+        self.rate_limiter = rate_limiter or SlidingWindowLimiter.for_api_key(
+            self.requests_per_minute, hourly_limit)
+        self.cache = cache
+        self.catalog = catalog
+        self.retry_policy = retry_policy or RetryPolicy()
+        self.key_pool = key_pool
+        self.metrics = metrics or RunMetrics()
+        self._details_catalog: Optional[BreachCatalog] = None
+        self._session = None
+        # Per-thread stop event of the check_many call that owns a worker thread
+        self._worker = threading.local()
         
-        self.session = requests.Session()
-        self.session.headers.update({
-            'hibp-api-key': self.api_key,
-            'User-Agent': 'DarkWebChecker/1.0'
-        })
-        
-        logger.info(f"Initialized with hourly limit: {hourly_limit} requests/hour, delay: {request_delay}s")
+        logger.info(f"Initialized with hourly limit: {hourly_limit} requests/hour, "
+                    f"{self.requests_per_minute:g} requests/minute")
+    
+    @property
+    def session(self) -> 'requests.Session':
+        """HTTP session for API requests, created on first use so cached answers need no network stack."""
+        if self._session is None:
+            self._session = new_session({'hibp-api-key': self.api_key, 'User-Agent': 'DarkWebChecker/1.0'})
+        return self._session
         
     def display_banner(self):
         """Display the application banner."""
@@ -92,44 +1832,173 @@ class DarkWebChecker:
         print("🔍 Checking email addresses for data breaches...")
         print("⚠️  Remember: This tool is for legitimate security purposes only!\n")
 
-    def _clean_old_requests(self):
-        """Remove request timestamps older than 1 hour."""
-        one_hour_ago = datetime.now() - timedelta(hours=1)
-        self.request_history = [
-            timestamp for timestamp in self.request_history 
-            if timestamp > one_hour_ago
-        ]
+    def _wait_for_rate_limit(self, limiter: Optional[RateLimiter] = None,
+                             wait_seconds: Optional[float] = None) -> float:
+        """
+        Wait until the shared rate limiter permits another request.
+
+        Args:
+            limiter (Optional[RateLimiter]): Limiter to wait for (default: self.rate_limiter)
+            wait_seconds (Optional[float]): Wait of a slot already reserved on the limiter
+
+        Returns:
+            float: Seconds spent waiting
+        """
+        limiter = limiter or self.rate_limiter
+        waited = 0.0
+        if wait_seconds is None:
+            wait_seconds = limiter.reserve()
+        while wait_seconds > 0:
+            if wait_seconds > 60:
+                logger.warning(f"Rate limit reached. Waiting {wait_seconds:.0f} seconds...")
+                print(f"⏳ Rate limit reached. Waiting {wait_seconds:.0f} seconds until next request...")
+            self._sleep(wait_seconds)
+            waited += wait_seconds
+            # The API may have pushed back while we slept, voiding the slot
+            wait_seconds = limiter.reclaim_if_paused()
+        self.metrics.observe('limiter_wait', waited)
+        return waited
+
+    def _sleep(self, seconds: float):
+        """
+        Sleep unless the check_many call running this worker is shutting down.
+        
+        Args:
+            seconds (float): Seconds to sleep
+            
+        Raises:
+            RuntimeError: If check_many was closed or interrupted before or during the sleep
+        """
+        stop = getattr(self._worker, 'stop', None)
+        if stop is None:
+            time.sleep(seconds)
+        elif stop.wait(seconds):
+            raise RuntimeError("Check cancelled")
+
+    def _bind_stop(self, stop: threading.Event):
+        """Attach a check_many call's stop event to the current worker thread."""
+        self._worker.stop = stop
 
-    def _check_rate_limit(self) -> bool:
+    def _request(self, url: str, params: Optional[Dict[str, str]] = None) -> 'requests.Response':
         """
-        Check if we can make another request within the hourly limit.
+        Send a rate-limited GET request, retrying according to the retry policy.
         
+        Retries run in a loop rather than recursively. A 429 pauses the shared
+        rate limiter, so every worker backs off, not only the one that got it.
+        With a key pool, each attempt goes out on the key with capacity next,
+        a 429 pauses only that key and a rejected key is dropped from the pool.
+        
+        Args:
+            url (str): Request URL
+            params (Optional[Dict[str, str]]): Query parameters
+            
         Returns:
-            bool: True if request is allowed, False if rate limit exceeded
+            requests.Response: Final response (possibly a 429/5xx once retries are exhausted)
+            
+        Raises:
+            requests.exceptions.RequestException: If the network error persists
+            RuntimeError: If every key of the key pool has been rejected
         """
-        self._clean_old_requests()
-        return len(self.request_history) < self.hourly_limit
+        import requests
+        
+        attempt = 0
+        while True:
+            if self.key_pool is not None:
+                slot, wait_seconds = self.key_pool.reserve()
+                session, limiter = slot.session, slot.rate_limiter
+                self._wait_for_rate_limit(limiter, wait_seconds)
+            else:
+                slot, session, limiter = None, self.session, self.rate_limiter
+                self._wait_for_rate_limit(limiter)
+            started = time.perf_counter()
+            try:
+                response = session.get(url, params=params, timeout=30)
+            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as e:
+                self.metrics.observe('request', time.perf_counter() - started)
+                self.metrics.count('network_errors')
+                if not self.retry_policy.allow(attempt):
+                    raise
+                delay = self.retry_policy.delay(attempt)
+                logger.warning(f"Network error ({str(e)}). Retrying in {delay:.1f}s...")
+                self._sleep(delay)
+                self.metrics.count('retries')
+                attempt += 1
+                continue
+            self.metrics.observe('request', time.perf_counter() - started)
+            self.metrics.count_response(response.status_code)
+            
+            if slot is not None and response.status_code in (401, 403) \
+                    and not url.startswith(f"{self.base_url}/breacheddomain/"):
+                # Try the request again on another key; a 403 on a domain search means
+                # the domain is not verified rather than a bad key
+                self.key_pool.disable(slot, f"API error {response.status_code}")
+                self.metrics.count('keys_disabled')
+                continue
+            
+            if response.status_code not in RetryPolicy.RETRY_STATUSES:
+                return response
+            
+            retry = self.retry_policy.allow(attempt)
+            delay = self.retry_policy.delay(attempt, parse_retry_after(response.headers.get('Retry-After')))
+            if response.status_code == 429:
+                # Honor the server's pushback for every worker even when this request
+                # is not retried, so the others do not keep sending into the throttle
+                owner = f"API key {slot.label}" if slot is not None else "all requests"
+                logger.warning(f"Rate limit exceeded by API. Pausing {owner} for {delay:.1f}s...")
+                limiter.pause(delay)
+            if not retry:
+                return response
+            if response.status_code != 429:
+                logger.warning(f"API error {response.status_code}. Retrying in {delay:.1f}s...")
+                self._sleep(delay)
+            self.metrics.count('retries')
+            attempt += 1
 
-    def _wait_for_rate_limit(self):
-        """Wait until we can make another request within the hourly limit."""
-        while not self._check_rate_limit():
-            self._clean_old_requests()
-            oldest_request = min(self.request_history) if self.request_history else datetime.now()
-            wait_until = oldest_request + timedelta(hours=1)
-            wait_seconds = (wait_until - datetime.now()).total_seconds()
+    def check_email_breach(self, email: str, use_cache: bool = True) -> Dict[str, Any]:
+        """
+        Check if an email address has been involved in data breaches.
+        
+        A valid entry in the result cache is returned without touching the
+        rate limiter or the API.
+        
+        Args:
+            email (str): Email address to check
+            use_cache (bool): Answer from the result cache when possible (default: True);
+                fresh results are stored in the cache either way
             
-            if wait_seconds > 0:
-                logger.warning(f"Hourly rate limit ({self.hourly_limit}) reached. Waiting {wait_seconds:.0f} seconds...")
-                print(f"⏳ Rate limit reached. Waiting {wait_seconds:.0f} seconds until next request...")
-                time.sleep(min(wait_seconds, 60))  # Wait in chunks of max 60 seconds
+        Returns:
+            Dict[str, Any]: Breach information or error details
+        """
+        if self.cache is not None and use_cache:
+            cached = self.cache.get(email)
+            if cached is not None and self._adapt_cached(cached):
+                logger.debug(f"Cache hit for {email}")
+                return cached
+        
+        result = self._query_email_breach(email)
+        if self.cache is not None:
+            self.cache.put(result)
+        return result
 
-    def _record_request(self):
-        """Record the timestamp of a request."""
-        self.request_history.append(datetime.now())
+    def _adapt_cached(self, result: Dict[str, Any]) -> bool:
+        """
+        Convert a cached result to the breach representation of the current mode.
+        
+        Args:
+            result (Dict[str, Any]): Cached result, modified in place
+            
+        Returns:
+            bool: False if the result cannot be used (name references without a catalog)
+        """
+        breaches = result.get('breaches') or []
+        if self.catalog is not None:
+            result['breaches'] = [breach_name(breach) for breach in breaches]
+            return True
+        return not any(isinstance(breach, str) for breach in breaches)
 
-    def check_email_breach(self, email: str) -> Dict[str, Any]:
+    def _query_email_breach(self, email: str) -> Dict[str, Any]:
         """
-        Check if an email address has been involved in data breaches.
+        Query the API for an email address, honoring the rate limiter.
         
         Args:
             email (str): Email address to check
@@ -137,52 +2006,18 @@ class DarkWebChecker:
         Returns:
             Dict[str, Any]: Breach information or error details
         """
+        import requests
+        
         try:
-            # Check and wait for rate limit
-            self._wait_for_rate_limit()
-            
             url = f"{self.base_url}/breachedaccount/{email}"
-            params = {'truncateResponse': 'false'}
-            
-            logger.info(f"Checking email: {email} (Requests this hour: {len(self.request_history)})")
-            
-            # Record the request
-            self._record_request()
-            
-            response = self.session.get(url, params=params, timeout=30)
-            
-            if response.status_code == 200:
-                breaches = response.json()
-                logger.info(f"Found {len(breaches)} breaches for {email}")
-                return {
-                    'email': email,
-                    'status': 'found',
-                    'breach_count': len(breaches),
-                    'breaches': breaches,
-                    'checked_at': time.strftime('%Y-%m-%d %H:%M:%S')
-                }
-            elif response.status_code == 404:
-                logger.info(f"No breaches found for {email}")
-                return {
-                    'email': email,
-                    'status': 'clean',
-                    'breach_count': 0,
-                    'breaches': [],
-                    'checked_at': time.strftime('%Y-%m-%d %H:%M:%S')
-                }
-            elif response.status_code == 429:
-                logger.warning(f"Rate limit exceeded by API. Waiting...")
-                time.sleep(6)  # Wait 6 seconds for API rate limit
-                return self.check_email_breach(email)  # Retry
-            else:
-                error_msg = f"API error {response.status_code}: {response.text}"
-                logger.error(error_msg)
-                return {
-                    'email': email,
-                    'status': 'error',
-                    'error': error_msg,
-                    'checked_at': time.strftime('%Y-%m-%d %H:%M:%S')
-                }
+            # In catalog mode only breach names are needed, the metadata comes from the catalog
+            params = {'truncateResponse': 'true' if self.catalog is not None else 'false'}
+            
+            logger.info(f"Checking email: {email}")
+            
+            # Waits for the rate limiter and retries 429/5xx/network errors
+            response = self._request(url, params=params)
+            return self._result_from_response(email, response)
                 
         except requests.exceptions.RequestException as e:
             error_msg = f"Network error: {str(e)}"
@@ -193,6 +2028,15 @@ class DarkWebChecker:
                 'error': error_msg,
                 'checked_at': time.strftime('%Y-%m-%d %H:%M:%S')
             }
+        except RuntimeError as e:
+            error_msg = str(e)
+            logger.error(error_msg)
+            return {
+                'email': email,
+                'status': 'error',
+                'error': error_msg,
+                'checked_at': time.strftime('%Y-%m-%d %H:%M:%S')
+            }
         except Exception as e:
             error_msg = f"Unexpected error: {str(e)}"
             logger.error(error_msg)
@@ -203,6 +2047,360 @@ class DarkWebChecker:
                 'checked_at': time.strftime('%Y-%m-%d %H:%M:%S')
             }
 
+    def _result_from_response(self, email: str, response: Any) -> Dict[str, Any]:
+        """
+        Build the check result for an API response.
+        
+        Args:
+            email (str): Email address that was checked
+            response (Any): requests.Response or AsyncResponse of the breachedaccount request
+            
+        Returns:
+            Dict[str, Any]: Breach information or error details
+        """
+        if response.status_code == 200:
+            started = time.perf_counter()
+            breaches = response.json()
+            self.metrics.observe('parse', time.perf_counter() - started)
+            if self.catalog is not None:
+                breaches = [breach_name(breach) for breach in breaches]
+            logger.info(f"Found {len(breaches)} breaches for {email}")
+            return {
+                'email': email,
+                'status': 'found',
+                'breach_count': len(breaches),
+                'breaches': breaches,
+                'checked_at': time.strftime('%Y-%m-%d %H:%M:%S')
+            }
+        elif response.status_code == 404:
+            logger.info(f"No breaches found for {email}")
+            return {
+                'email': email,
+                'status': 'clean',
+                'breach_count': 0,
+                'breaches': [],
+                'checked_at': time.strftime('%Y-%m-%d %H:%M:%S')
+            }
+        else:
+            error_msg = f"API error {response.status_code}: {response.text}"
+            logger.error(error_msg)
+            return {
+                'email': email,
+                'status': 'error',
+                'error': error_msg,
+                'checked_at': time.strftime('%Y-%m-%d %H:%M:%S')
+            }
+
+    def check_many(self, emails: Iterable[str], max_workers: int = 4,
+                   use_cache: bool = True) -> Iterator[Dict[str, Any]]:
+        """
+        Check many email addresses with several requests in flight.
+        
+        All workers share the checker's rate limiters, so the configured
+        per-minute and hourly limits hold no matter how many threads run.
+        Results are yielded as soon as each check completes, which means
+        their order may differ from the input order.
+        
+        Args:
+            emails (Iterable[str]): Email addresses to check
+            max_workers (int): Number of concurrent requests (default: 4)
+            use_cache (bool): Answer from the result cache when possible (default: True)
+            
+        Yields:
+            Dict[str, Any]: Result of each check, in completion order
+        """
+        if max_workers <= 1:
+            for email in emails:
+                yield self.check_email_breach(email, use_cache)
+            return
+        
+        from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+        from requests.adapters import HTTPAdapter
+        
+        # Keep one pooled connection per worker instead of requests' default of 10
+        sessions = [self.session] + [slot.session for slot in (self.key_pool.slots if self.key_pool else [])]
+        for session in sessions:
+            adapter = HTTPAdapter(pool_connections=1, pool_maxsize=max_workers)
+            session.mount('https://', adapter)
+            session.mount('http://', adapter)
+        
+        email_iter = iter(emails)
+        # One event per call, so a finished or interrupted run never cancels later checks
+        stop = threading.Event()
+        with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='dwc-worker',
+                                initializer=self._bind_stop, initargs=(stop,)) as executor:
+            # Bound the number of queued checks so huge inputs are not submitted at once
+            pending = {executor.submit(self.check_email_breach, email, use_cache)
+                       for email in islice(email_iter, max_workers * 2)}
+            try:
+                while pending:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        yield future.result()
+                    for email in islice(email_iter, len(done)):
+                        pending.add(executor.submit(self.check_email_breach, email, use_cache))
+            finally:
+                # Leaving early (Ctrl-C, closed generator): drop queued checks and wake
+                # workers sleeping on the limiter so the executor can be joined promptly
+                stop.set()
+                for future in pending:
+                    future.cancel()
+
+    def watch(self, emails: Iterable[str], state: WatchState, max_workers: int = 4) -> Dict[str, Any]:
+        """
+        Re-check only the addresses that a newly added breach could affect.
+        
+        The breach catalog is downloaded first. An address is queried again
+        only if the watch state does not know it yet or a breach was added to
+        Have I Been Pwned after its last check; all other addresses keep their
+        known breaches without an API request. Queries bypass the result cache.
+        
+        Args:
+            emails (Iterable[str]): Email addresses to watch
+            state (WatchState): Known breaches from previous runs, updated in place
+            max_workers (int): Number of concurrent requests (default: 4)
+            
+        Returns:
+            Dict[str, Any]: Diff report with the breaches added to the catalog since
+                the previous run and the addresses whose breaches changed
+        """
+        started = time.time()
+        if self.catalog is None:
+            self.catalog = BreachCatalog()
+        self.catalog.refresh(self.session, self.base_url)
+        added_at = {name: parse_added_date(breach.get('AddedDate')) for name, breach in self.catalog.breaches.items()}
+        newest = max(added_at.values(), default=0.0)
+        since = state.last_added()
+        
+        report = {
+            'checked_at': time.strftime('%Y-%m-%d %H:%M:%S'),
+            'since': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime(since)) if since is not None else None,
+            'new_breaches': sorted(name for name, added in added_at.items() if since is not None and added > since),
+            'rechecked': 0,
+            'unchanged': 0,
+            'errors': 0,
+            'changes': []
+        }
+        
+        def candidates() -> Iterator[str]:
+            for email in emails:
+                known = state.get(email)
+                if known is not None and known[1] >= newest:
+                    report['unchanged'] += 1
+                else:
+                    yield email
+        
+        for result in self.check_many(candidates(), max_workers=max_workers, use_cache=False):
+            report['rechecked'] += 1
+            if result['status'] == 'error':
+                # Keep the old state so the address is checked again next run
+                report['errors'] += 1
+                continue
+            names = {breach_name(breach) for breach in result['breaches']}
+            known = state.get(result['email'])
+            old_names = set(known[0]) if known else set()
+            # Breaches added while this run was in progress are picked up next run
+            state.put(result['email'], names, started)
+            if names != old_names:
+                report['changes'].append({
+                    'email': result['email'],
+                    'added': sorted(names - old_names),
+                    'removed': sorted(old_names - names)
+                })
+        state.set_last_added(newest)
+        return report
+
+    def save_watch_report(self, report: Dict[str, Any], output_file: str):
+        """
+        Save a watch diff report.
+        
+        JSON reports include the catalog entries of all new and changed
+        breaches; JSON Lines and CSV reports hold one line per changed address.
+        
+        Args:
+            report (Dict[str, Any]): Report returned by watch
+            output_file (str): Output file path
+        """
+        try:
+            file_ext = Path(output_file).suffix.lower()
+            if file_ext == '.json':
+                names = set(report['new_breaches'])
+                for change in report['changes']:
+                    names.update(change['added'])
+                with open(output_file, 'w', encoding='utf-8') as f:
+                    json.dump(dict(report, breaches=self.resolve_breaches(names)), f, indent=2, ensure_ascii=False)
+            elif file_ext in ('.jsonl', '.ndjson'):
+                with open(output_file, 'w', encoding='utf-8') as f:
+                    for change in report['changes']:
+                        f.write(json.dumps(change, ensure_ascii=False) + '\n')
+            elif file_ext == '.csv':
+                with open(output_file, 'w', newline='', encoding='utf-8') as f:
+                    writer = csv.writer(f)
+                    writer.writerow(['email', 'added', 'removed'])
+                    for change in report['changes']:
+                        writer.writerow([change['email'], '; '.join(change['added']), '; '.join(change['removed'])])
+            else:
+                with open(output_file, 'w', encoding='utf-8') as f:
+                    f.write("Dark Web Checker Watch Report\n")
+                    f.write("=" * 50 + "\n\n")
+                    f.write(f"Checked At: {report['checked_at']}\n")
+                    f.write(f"Previous Run: {report['since'] or 'none (baseline)'}\n")
+                    f.write(f"New Breaches: {', '.join(report['new_breaches']) or 'none'}\n")
+                    f.write(f"Re-checked: {report['rechecked']}, Unchanged: {report['unchanged']}, "
+                            f"Errors: {report['errors']}\n\n")
+                    for change in report['changes']:
+                        f.write(f"Email: {change['email']}\n")
+                        for name in change['added']:
+                            f.write(f"  + {name}\n")
+                        for name in change['removed']:
+                            f.write(f"  - {name}\n")
+                        f.write("-" * 30 + "\n")
+            
+            logger.info(f"Watch report saved to {output_file}")
+            
+        except Exception as e:
+            logger.error(f"Error saving watch report: {str(e)}")
+            raise
+
+    def fetch_domain_breaches(self, domain: str) -> Optional[Dict[str, List[str]]]:
+        """
+        Fetch the breached aliases of a verified domain with a single API call.
+        
+        Args:
+            domain (str): Domain verified for the API key's subscription
+            
+        Returns:
+            Optional[Dict[str, List[str]]]: Breach names by lowercased alias (the part
+            before '@'), or None if the domain cannot be searched with this key
+        """
+        import requests
+        
+        try:
+            logger.info(f"Checking domain: {domain}")
+            response = self._request(f"{self.base_url}/breacheddomain/{domain}")
+        except (requests.exceptions.RequestException, RuntimeError) as e:
+            logger.error(f"Error checking domain {domain}: {str(e)}")
+            return None
+        
+        if response.status_code == 200:
+            return {alias.lower(): names for alias, names in (response.json() or {}).items()}
+        elif response.status_code == 404:
+            return {}
+        else:
+            logger.warning(f"Domain search unavailable for {domain} "
+                           f"(API error {response.status_code}), checking its emails individually")
+            return None
+
+    def check_many_by_domain(self, emails: Iterable[str], verified_domains: Iterable[str],
+                             max_workers: int = 4) -> Iterator[Dict[str, Any]]:
+        """
+        Check email addresses using one breached-domain call per verified domain.
+        
+        Addresses on a verified domain are answered from a single
+        breacheddomain lookup per domain, made when its first address is read,
+        as per-email results shaped like those of check_email_breach. All
+        other addresses, and those of domains the API refuses to search, go
+        to check_many as they are read, so checks start on the first address.
+        
+        Args:
+            emails (Iterable[str]): Email addresses to check
+            verified_domains (Iterable[str]): Domains verified for the API key
+            max_workers (int): Number of concurrent per-account requests (default: 4)
+            
+        Yields:
+            Dict[str, Any]: Result of each check
+        """
+        verified = {domain.strip().lower() for domain in verified_domains if domain.strip()}
+        # Breached aliases and breach details of each verified domain, None if it cannot be searched
+        lookups: Dict[str, Optional[Tuple[Dict[str, List[str]], Optional[Dict[str, Dict[str, Any]]]]]] = {}
+        answered: deque = deque()
+        email_iter = iter(emails)
+        exhausted = False
+        
+        def domain_result(email: str, breached: Dict[str, List[str]],
+                          full_breaches: Optional[Dict[str, Dict[str, Any]]]) -> Dict[str, Any]:
+            breach_names = breached.get(email.rsplit('@', 1)[0].lower(), [])
+            breaches = list(breach_names) if full_breaches is None else \
+                [full_breaches.get(name, {'Name': name}) for name in breach_names]
+            result = {
+                'email': email,
+                'status': 'found' if breaches else 'clean',
+                'breach_count': len(breaches),
+                'breaches': breaches,
+                'checked_at': time.strftime('%Y-%m-%d %H:%M:%S')
+            }
+            if self.cache is not None:
+                self.cache.put(result)
+            return result
+        
+        def per_account() -> Iterator[str]:
+            # Runs in the consuming thread as check_many pulls addresses, so
+            # other domains reach the workers as they are read; answers from a
+            # domain lookup wait in `answered` until the next result is yielded
+            nonlocal exhausted
+            for email in email_iter:
+                domain = email.rsplit('@', 1)[-1].lower()
+                if domain not in verified:
+                    yield email
+                    continue
+                cached = self.cache.get(email) if self.cache is not None else None
+                if cached is not None and self._adapt_cached(cached):
+                    answered.append(cached)
+                    continue
+                if domain not in lookups:
+                    breached = self.fetch_domain_breaches(domain)
+                    if breached is None:
+                        lookups[domain] = None
+                    else:
+                        logger.info(f"Domain {domain}: {len(breached)} breached aliases")
+                        names = {name for breach_names in breached.values() for name in breach_names}
+                        lookups[domain] = (breached, None if self.catalog is not None else self._breach_details(names))
+                if lookups[domain] is None:
+                    yield email
+                else:
+                    answered.append(domain_result(email, *lookups[domain]))
+                if len(answered) >= 1000:
+                    # End this round so long runs of domain answers are not all held in memory
+                    return
+            exhausted = True
+        
+        while True:
+            for result in self.check_many(per_account(), max_workers=max_workers):
+                while answered:
+                    yield answered.popleft()
+                yield result
+            while answered:
+                yield answered.popleft()
+            if exhausted:
+                return
+
+    def _breach_details(self, names: Iterable[str]) -> Dict[str, Dict[str, Any]]:
+        """
+        Look up full breach objects for names outside catalog mode.
+        
+        A throwaway in-memory catalog is used, so the full-object result shape
+        is kept without writing a catalog file.
+        
+        Args:
+            names (Iterable[str]): Breach names to expand
+            
+        Returns:
+            Dict[str, Dict[str, Any]]: Breach objects by name
+        """
+        names = set(names)
+        if not names:
+            return {}
+        if self._details_catalog is None:
+            self._details_catalog = BreachCatalog(path=None)
+        if self._details_catalog.is_current(names):
+            return self._details_catalog.subset(names)
+        import requests
+        try:
+            self._details_catalog.ensure(self.session, self.base_url, names)
+        except (requests.exceptions.RequestException, ValueError) as e:
+            logger.warning(f"Could not fetch breach details: {str(e)}")
+        return self._details_catalog.subset(names)
+
     def load_emails_from_file(self, file_path: str) -> List[str]:
         """
         Load email addresses from various file formats.
@@ -211,96 +2409,317 @@ class DarkWebChecker:
             file_path (str): Path to the input file
             
         Returns:
-            List[str]: List of email addresses
+            List[str]: List of unique valid email addresses, in input order
         """
-        emails = []
-        file_extension = Path(file_path).suffix.lower()
+        valid_emails = list(self.iter_emails_from_file(file_path))
+        logger.info(f"Loaded {len(valid_emails)} valid email addresses from {file_path}")
+        return valid_emails
+
+    def iter_emails_from_file(self, file_path: str, bloom_capacity: Optional[int] = None,
+                              column: Optional[str] = None, json_path: Optional[str] = None,
+                              strip_plus: bool = False, gmail_dots: bool = False,
+                              progress: Optional[InputProgress] = None) -> Iterator[str]:
+        """
+        Stream valid, deduplicated email addresses from a file.
+        
+        By default the file is memory-mapped and a single precompiled regex
+        extracts every address it contains, whatever the format, without
+        parsing CSV rows or JSON documents. A CSV column or JSON path can be
+        given instead to only read addresses from that field. Addresses are
+        trimmed and lowercased and yielded in input order as they are found.
+        
+        Duplicates are tracked as 64-bit hashes of the normalized address;
+        with bloom_capacity set, a Bloom filter is used instead, which needs
+        a fixed ~2 bytes per expected address but may skip a tiny fraction
+        (about 0.1%) of unique addresses. strip_plus and gmail_dots make
+        address variants count as duplicates of the first one seen.
         
+        Args:
+            file_path (str): Path to the input file (.txt, .csv, .json, .jsonl/.ndjson)
+            bloom_capacity (Optional[int]): Expected number of addresses for Bloom filter dedupe
+            column (Optional[str]): CSV column to read, by header name or 1-based position
+            json_path (Optional[str]): Dotted path of the field to read in JSON and JSON-lines
+                records, with '*' matching every list item or object value (e.g. 'users.*.email')
+            strip_plus (bool): Ignore '+tag' suffixes of the local part for dedupe
+            gmail_dots (bool): Ignore dots in the local part of Gmail addresses for dedupe
+            progress (Optional[InputProgress]): Updated with the bytes read so far
+            
+        Yields:
+            str: Normalized email addresses not seen before
+        """
+        if bloom_capacity:
+            seen = BloomFilter(bloom_capacity)
+            is_duplicate = seen.add
+        else:
+            digests = set()
+            
+            def is_duplicate(key: str) -> bool:
+                # Python's string hash is a 64-bit SipHash, far cheaper than a cryptographic digest
+                digest = hash(key)
+                if digest in digests:
+                    return True
+                digests.add(digest)
+                return False
+        
+        canonical = strip_plus or gmail_dots
         try:
-            if file_extension == '.json':
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                    if isinstance(data, list):
-                        emails = [str(item) for item in data if '@' in str(item)]
-                    elif isinstance(data, dict):
-                        # Try to find email fields in the JSON
-                        for key, value in data.items():
-                            if isinstance(value, list):
-                                emails.extend([str(item) for item in value if '@' in str(item)])
-                            elif '@' in str(value):
-                                emails.append(str(value))
-                                
-            elif file_extension == '.csv':
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    csv_reader = csv.reader(f)
-                    for row in csv_reader:
-                        for cell in row:
-                            if '@' in str(cell):
-                                emails.append(str(cell).strip())
-                                
-            else:  # Treat as text file
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    for line in f:
-                        line = line.strip()
-                        if '@' in line:
-                            emails.append(line)
-                            
+            for candidate in self._iter_candidates(file_path, column, json_path, progress or InputProgress()):
+                email = normalize_email(candidate)
+                key = canonical_email(email, strip_plus, gmail_dots) if canonical else email
+                if not is_duplicate(key):
+                    yield email
         except Exception as e:
             logger.error(f"Error loading emails from file: {str(e)}")
             raise
+
+    def _iter_candidates(self, file_path: str, column: Optional[str] = None,
+                         json_path: Optional[str] = None,
+                         progress: Optional[InputProgress] = None) -> Iterator[str]:
+        """
+        Yield the valid addresses of a file, not yet normalized.
+        
+        Args:
+            file_path (str): Path to the input file
+            column (Optional[str]): CSV column to read instead of scanning the whole file
+            json_path (Optional[str]): JSON path to read instead of scanning the whole file
+            progress (Optional[InputProgress]): Updated with the bytes read so far
+            
+        Yields:
+            str: Addresses in input order, possibly with surrounding whitespace
+            
+        Raises:
+            ValueError: If the selection does not fit the file format or the column is missing
+        """
+        file_extension = Path(file_path).suffix.lower()
+        progress = progress or InputProgress()
+        progress.size = os.path.getsize(file_path)
+        
+        if column is not None:
+            if file_extension != '.csv':
+                raise ValueError(f"A column can only be selected in CSV files: {file_path}")
+            with open(file_path, 'r', newline='', encoding='utf-8') as f:
+                reader = csv.reader(progress.track(f))
+                header = next(reader, [])
+                if column.isdigit():
+                    index = int(column) - 1
+                else:
+                    names = [name.strip().lower() for name in header]
+                    if column.strip().lower() not in names:
+                        raise ValueError(f"Column {column!r} not found in {file_path}")
+                    index = names.index(column.strip().lower())
+                    header = []
+                # A numeric selection may point into a file without header row
+                rows = chain([header], reader) if header else reader
+                for row in rows:
+                    if index < len(row) and self.is_valid_email(row[index].strip()):
+                        yield row[index]
+        
+        elif json_path is not None:
+            if file_extension not in ('.json', '.jsonl', '.ndjson'):
+                raise ValueError(f"A JSON path can only be selected in JSON files: {file_path}")
+            parts = [part for part in json_path.split('.') if part]
+            for record in self._json_records(file_path, progress):
+                for value in self._json_path_values(record, parts):
+                    if self.is_valid_email(value.strip()):
+                        yield value
+        
+        else:
+            with open(file_path, 'rb') as f:
+                if os.fstat(f.fileno()).st_size == 0:
+                    return
+                # Matches of the scan pattern are valid addresses by construction
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                    for match in EMAIL_SCAN_PATTERN.finditer(mapped):
+                        progress.position = match.end()
+                        yield match.group().decode('ascii')
+
+    def _json_records(self, file_path: str, progress: Optional[InputProgress] = None) -> Iterator[Any]:
+        """
+        Yield the parsed document of a JSON file, or each record of a JSON-lines file.
+        
+        Args:
+            file_path (str): Path to the input file
+            progress (Optional[InputProgress]): Updated with the bytes read so far
+            
+        Yields:
+            Any: Parsed JSON values
+        """
+        progress = progress or InputProgress()
+        with open(file_path, 'r', encoding='utf-8') as f:
+            if Path(file_path).suffix.lower() == '.json':
+                # Read in one go, so there is no position to estimate an ETA from
+                yield json.load(f)
+            else:
+                for line in progress.track(f):
+                    if line.strip():
+                        yield json.loads(line)
+
+    def _json_path_values(self, data: Any, parts: List[str]) -> Iterator[str]:
+        """
+        Yield the string values found at a path in a parsed JSON value.
+        
+        Args:
+            data (Any): Parsed JSON document or JSON-lines record
+            parts (List[str]): Remaining path components ('*' matches every item)
+            
+        Yields:
+            str: Values at the path; lists at the end of the path are expanded
+        """
+        if not parts:
+            for item in data if isinstance(data, list) else [data]:
+                if isinstance(item, str):
+                    yield item
+            return
+        key, rest = parts[0], parts[1:]
+        if key == '*':
+            children = data.values() if isinstance(data, dict) else data if isinstance(data, list) else []
+        elif isinstance(data, dict):
+            children = [data[key]] if key in data else []
+        elif isinstance(data, list):
+            # Descend into every record of a list, e.g. 'users.email' on a list of users
+            children = [item[key] for item in data if isinstance(item, dict) and key in item]
+        else:
+            children = []
+        for child in children:
+            yield from self._json_path_values(child, rest)
+
+    def is_valid_email(self, email: str) -> bool:
+        """
+        Basic email validation.
+        
+        Args:
+            email (str): Email address to validate
+            
+        Returns:
+            bool: True if email appears valid
+        """
+        return EMAIL_PATTERN.fullmatch(email) is not None
+
+    def resolve_breaches(self, names: Iterable[str]) -> Dict[str, Dict[str, Any]]:
+        """
+        Look up catalog metadata for breach names, refreshing the catalog if needed.
+        
+        Args:
+            names (Iterable[str]): Breach names referenced by results
             
-        # Remove duplicates and validate emails
-        unique_emails = list(set(emails))
-        valid_emails = [email for email in unique_emails if self.is_valid_email(email)]
+        Returns:
+            Dict[str, Dict[str, Any]]: Breach metadata by name
+        """
+        names = set(names)
+        if self.catalog.is_current(names):
+            # Skip the session (and importing requests) when nothing is fetched
+            return self.catalog.subset(names)
+        import requests
+        try:
+            self.catalog.ensure(self.session, self.base_url, names)
+        except (requests.exceptions.RequestException, ValueError) as e:
+            logger.warning(f"Could not update breach catalog: {str(e)}")
+        return self.catalog.subset(names)
+
+    def open_result_writer(self, output_file: str, append: bool = False, table_format: str = 'jsonl'):
+        """
+        Open a streaming writer for an output path.
         
-        logger.info(f"Loaded {len(valid_emails)} valid email addresses from {file_path}")
-        return valid_emails
+        Args:
+            output_file (str): .jsonl, .ndjson, .csv file or .dwc directory
+            append (bool): Keep existing results and append after them (default: False)
+            table_format (str): Table format of .dwc outputs ('jsonl' or 'parquet')
+            
+        Returns:
+            ResultWriter or ColumnarWriter: Writer with write() and close()
+        """
+        if ColumnarWriter.supports(output_file):
+            return ColumnarWriter(output_file, append=append, table_format=table_format,
+                                  resolve_breaches=self.resolve_breaches if self.catalog is not None else None)
+        return ResultWriter(output_file, append=append)
 
-    def is_valid_email(self, email: str) -> bool:
+    @staticmethod
+    def supports_streaming(output_file: str) -> bool:
+        """Return True if results can be written to this output as they arrive."""
+        return ResultWriter.supports(output_file) or ColumnarWriter.supports(output_file)
+
+    def merge_results(self, input_files: Iterable[str], output_file: str) -> int:
         """
-        Basic email validation.
+        Merge JSON-lines outputs, e.g. of several shards, into one output file.
+        
+        CSV, JSON-lines and .dwc targets are written while the inputs are
+        streamed; other formats are built in memory and written by save_results.
+        Lines damaged by a crash are skipped, and of several results for one
+        email (an error re-checked by --resume) only the last is kept.
         
         Args:
-            email (str): Email address to validate
+            input_files (Iterable[str]): JSON-lines result files
+            output_file (str): Output file path (any format save_results supports)
             
         Returns:
-            bool: True if email appears valid
+            int: Number of merged results
         """
-        import re
-        pattern = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
-        return bool(re.match(pattern, email))
+        # Read twice by latest_results, so a one-shot iterator of paths is not enough
+        input_files = list(input_files)
+        
+        def records() -> Iterator[Dict[str, Any]]:
+            for input_file in input_files:
+                with open(input_file, 'r', encoding='utf-8') as f:
+                    yield from ResultWriter._json_lines(f)
+        
+        merged = 0
+        if self.supports_streaming(output_file):
+            with self.open_result_writer(output_file) as writer:
+                for record in latest_results(records):
+                    writer.write(record)
+                    merged += 1
+        else:
+            results = list(latest_results(records))
+            self.save_results(results, output_file)
+            merged = len(results)
+        logger.info(f"Merged {merged} results into {output_file}")
+        return merged
 
     def save_results(self, results: List[Dict[str, Any]], output_file: str):
         """
         Save results to output file.
         
+        In catalog mode the JSON output holds a deduplicated ``breaches``
+        section with the metadata of every referenced breach, next to the
+        per-email ``results`` that reference it by name.
+        
         Args:
             results (List[Dict[str, Any]]): Results to save
             output_file (str): Output file path
         """
         file_extension = Path(output_file).suffix.lower()
+        catalog = {}
+        if self.catalog is not None and file_extension in ('.json', '.txt'):
+            catalog = self.resolve_breaches(
+                breach_name(breach) for result in results for breach in result.get('breaches') or []
+            )
         
         try:
-            if file_extension == '.json':
+            if ColumnarWriter.supports(output_file):
+                with self.open_result_writer(output_file) as writer:
+                    for result in results:
+                        writer.write(result)
+            elif file_extension == '.json':
                 with open(output_file, 'w', encoding='utf-8') as f:
-                    json.dump(results, f, indent=2, ensure_ascii=False)
+                    if self.catalog is not None:
+                        json.dump({'breaches': catalog, 'results': results}, f, indent=2, ensure_ascii=False)
+                    else:
+                        json.dump(results, f, indent=2, ensure_ascii=False)
                     
             elif file_extension == '.csv':
                 with open(output_file, 'w', newline='', encoding='utf-8') as f:
                     if results:
-                        fieldnames = ['email', 'status', 'breach_count', 'checked_at']
-                        writer = csv.DictWriter(f, fieldnames=fieldnames)
+                        writer = csv.DictWriter(f, fieldnames=CSV_FIELDS)
                         writer.writeheader()
                         
                         for result in results:
-                            row = {
-                                'email': result['email'],
-                                'status': result['status'],
-                                'breach_count': result.get('breach_count', 0),
-                                'checked_at': result['checked_at']
-                            }
-                            writer.writerow(row)
+                            writer.writerow(csv_row(result))
                             
+            elif file_extension in ('.jsonl', '.ndjson'):
+                with open(output_file, 'w', encoding='utf-8') as f:
+                    for result in results:
+                        f.write(json.dumps(result, ensure_ascii=False) + '\n')
+                        
             else:  # Text format
                 with open(output_file, 'w', encoding='utf-8') as f:
                     f.write("Dark Web Checker Results\n")
@@ -315,6 +2734,8 @@ class DarkWebChecker:
                         if result['status'] == 'found' and result.get('breaches'):
                             f.write("Breaches:\n")
                             for breach in result['breaches']:
+                                if isinstance(breach, str):
+                                    breach = catalog.get(breach, {'Name': breach})
                                 f.write(f"  - {breach.get('Name', 'Unknown')}: {breach.get('BreachDate', 'Unknown date')}\n")
                         elif result['status'] == 'error':
                             f.write(f"Error: {result.get('error', 'Unknown error')}\n")
@@ -327,6 +2748,862 @@ class DarkWebChecker:
             logger.error(f"Error saving results: {str(e)}")
             raise
 
+class AsyncResponse:
+    """Response of an AsyncConnectionPool request, mirroring the parts of requests.Response used here."""
+    
+    def __init__(self, status_code: int, headers: Dict[str, str], content: bytes):
+        """
+        Initialize the response.
+        
+        Args:
+            status_code (int): HTTP status code
+            headers (Dict[str, str]): Response headers with lowercased names
+            content (bytes): Response body
+        """
+        self.status_code = status_code
+        self.headers = headers
+        self.content = content
+    
+    @property
+    def text(self) -> str:
+        """Response body decoded as UTF-8."""
+        return self.content.decode('utf-8', 'replace')
+    
+    def json(self) -> Any:
+        """Parse the response body as JSON."""
+        return json.loads(self.content)
+
+class AsyncConnectionPool:
+    """
+    Minimal asyncio HTTP/1.1 client keeping a pool of keep-alive connections to one host.
+    
+    Only GET requests are supported, which is all the HIBP API needs. Up to
+    max_connections requests run at once, each on its own connection; idle
+    connections are reused until keepalive_expiry, and a request that finds
+    its reused connection closed by the server is sent again on a new one.
+    """
+    
+    def __init__(self, base_url: str, headers: Optional[Dict[str, str]] = None, max_connections: int = 8,
+                 timeout: float = 30.0, keepalive_expiry: float = 30.0):
+        """
+        Initialize the pool; connections are opened on demand.
+        
+        Args:
+            base_url (str): Scheme, host and base path requests are relative to
+            headers (Optional[Dict[str, str]]): Headers sent with every request
+            max_connections (int): Maximum number of open connections (default: 8)
+            timeout (float): Seconds allowed for connecting and for each request (default: 30)
+            keepalive_expiry (float): Seconds an idle connection is kept for reuse (default: 30)
+        """
+        import ssl
+        
+        parts = urlsplit(base_url)
+        default_port = 443 if parts.scheme == 'https' else 80
+        self.host = parts.hostname
+        self.port = parts.port or default_port
+        # HTTP/1.1 requires the port in Host unless it is the scheme's default
+        host = f"[{self.host}]" if ':' in self.host else self.host
+        self.host_header = host if self.port == default_port else f"{host}:{self.port}"
+        self.base_path = parts.path.rstrip('/')
+        self.headers = dict(headers or {})
+        self.max_connections = max_connections
+        self.timeout = timeout
+        self.keepalive_expiry = keepalive_expiry
+        self._ssl = ssl.create_default_context() if parts.scheme == 'https' else None
+        self._idle: List[Tuple['asyncio.StreamReader', 'asyncio.StreamWriter', float]] = []
+        self._semaphore: Optional['asyncio.Semaphore'] = None
+    
+    async def get(self, path: str, params: Optional[Dict[str, str]] = None,
+                  headers: Optional[Dict[str, str]] = None) -> AsyncResponse:
+        """
+        Send a GET request.
+        
+        Args:
+            path (str): Path below the base URL, already percent-encoded
+            params (Optional[Dict[str, str]]): Query parameters
+            headers (Optional[Dict[str, str]]): Headers added to (or overriding) the pool's headers
+            
+        Returns:
+            AsyncResponse: Response to the request
+            
+        Raises:
+            OSError: If the connection fails
+            asyncio.TimeoutError: If the server does not answer within the timeout
+        """
+        import asyncio
+        
+        if self._semaphore is None:
+            # Created here so it binds to the running event loop
+            self._semaphore = asyncio.Semaphore(self.max_connections)
+        target = self.base_path + path + (f"?{urlencode(params)}" if params else '')
+        lines = [f"GET {target} HTTP/1.1", f"Host: {self.host_header}", "Connection: keep-alive"]
+        lines += [f"{name}: {value}" for name, value in dict(self.headers, **(headers or {})).items()]
+        request = ('\r\n'.join(lines) + '\r\n\r\n').encode('latin-1')
+        
+        async with self._semaphore:
+            connection = self._take_idle()
+            if connection is not None:
+                try:
+                    return await self._exchange(connection, request)
+                except (ConnectionError, asyncio.IncompleteReadError):
+                    # The server closed the idle connection; a GET is safe to send again
+                    pass
+            connection = await asyncio.wait_for(
+                asyncio.open_connection(self.host, self.port, ssl=self._ssl), self.timeout)
+            return await self._exchange(connection, request)
+    
+    def _take_idle(self) -> Optional[Tuple['asyncio.StreamReader', 'asyncio.StreamWriter']]:
+        """Return the most recently used idle connection that is still fresh."""
+        now = time.monotonic()
+        while self._idle:
+            reader, writer, last_used = self._idle.pop()
+            if now - last_used < self.keepalive_expiry and not reader.at_eof():
+                return reader, writer
+            writer.close()
+        return None
+    
+    async def _exchange(self, connection: Tuple['asyncio.StreamReader', 'asyncio.StreamWriter'],
+                        request: bytes) -> AsyncResponse:
+        """Send a request on a connection and read the response, pooling the connection afterwards."""
+        import asyncio
+        
+        reader, writer = connection
+        try:
+            writer.write(request)
+            response, keep_alive = await asyncio.wait_for(self._read_response(reader), self.timeout)
+        except BaseException:
+            # Includes cancellation: a half-read connection can never be reused
+            writer.close()
+            raise
+        if keep_alive:
+            self._idle.append((reader, writer, time.monotonic()))
+        else:
+            writer.close()
+        return response
+    
+    @staticmethod
+    async def _read_response(reader: 'asyncio.StreamReader') -> Tuple[AsyncResponse, bool]:
+        """Read one response; returns it and whether the connection can be reused."""
+        while True:
+            status_line = await reader.readline()
+            if not status_line:
+                raise ConnectionError("Connection closed by server")
+            version, status = status_line.decode('latin-1').split(None, 2)[:2]
+            headers = {}
+            while True:
+                line = await reader.readline()
+                if line in (b'\r\n', b'\n', b''):
+                    break
+                name, _, value = line.decode('latin-1').partition(':')
+                headers[name.strip().lower()] = value.strip()
+            # Skip interim responses such as 100 Continue
+            if not 100 <= int(status) < 200:
+                break
+        
+        status = int(status)
+        keep_alive = version == 'HTTP/1.1' and headers.get('connection', '').lower() != 'close'
+        if headers.get('transfer-encoding', '').lower() == 'chunked':
+            chunks = []
+            while True:
+                size = int((await reader.readline()).split(b';', 1)[0], 16)
+                if size == 0:
+                    while (await reader.readline()) not in (b'\r\n', b'\n', b''):
+                        pass
+                    break
+                chunks.append(await reader.readexactly(size))
+                await reader.readexactly(2)
+            content = b''.join(chunks)
+        elif 'content-length' in headers:
+            content = await reader.readexactly(int(headers['content-length']))
+        elif status in (204, 304):
+            content = b''
+        else:
+            # Body delimited by the end of the connection
+            content = await reader.read()
+            keep_alive = False
+        return AsyncResponse(status, headers, content), keep_alive
+    
+    async def close(self):
+        """Close all idle connections."""
+        while self._idle:
+            _, writer, _ = self._idle.pop()
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except OSError:
+                pass
+
+class AsyncDarkWebChecker:
+    """
+    asyncio client for breach lookups, for embedding in async services.
+    
+    It takes the same options as DarkWebChecker and shares its rate limiters,
+    result cache, retry policy and key pool semantics, but sends requests over
+    a pooled keep-alive AsyncConnectionPool without blocking a thread per
+    request. Calls that may block on disk or on the sync HTTP session (limiter
+    and key pool bookings, which are SQLite transactions for SharedRateLimiter,
+    the result cache and breach catalog refreshes) run in the event loop's
+    default executor. It never prints or prompts; progress is reported through
+    logging.
+    """
+    
+    def __init__(self, api_key: str, max_connections: int = 8, **options: Any):
+        """
+        Initialize the async checker.
+        
+        Args:
+            api_key (str): Have I Been Pwned API key
+            max_connections (int): Size of the keep-alive connection pool (default: 8)
+            **options: Any keyword argument of DarkWebChecker (rate limits, cache,
+                catalog, retry_policy, key_pool, metrics, ...)
+        """
+        self.checker = DarkWebChecker(api_key, **options)
+        self.max_connections = max_connections
+        self._pool: Optional[AsyncConnectionPool] = None
+    
+    @property
+    def pool(self) -> AsyncConnectionPool:
+        """Connection pool to the API, created on first use."""
+        if self._pool is None:
+            self._pool = AsyncConnectionPool(
+                self.checker.base_url,
+                headers={'hibp-api-key': self.checker.api_key, 'User-Agent': 'DarkWebChecker/1.0'},
+                max_connections=self.max_connections)
+        return self._pool
+    
+    @staticmethod
+    async def _run_blocking(func: Callable, *args: Any) -> Any:
+        """Run a blocking call in the event loop's default executor."""
+        import asyncio
+        
+        return await asyncio.get_running_loop().run_in_executor(None, func, *args)
+    
+    async def _wait_for_rate_limit(self, limiter: RateLimiter, wait_seconds: float):
+        """Sleep until a reserved slot starts, claiming a new one if a pause began meanwhile."""
+        import asyncio
+        
+        waited = 0.0
+        while wait_seconds > 0:
+            if wait_seconds > 60:
+                logger.warning(f"Rate limit reached. Waiting {wait_seconds:.0f} seconds...")
+            await asyncio.sleep(wait_seconds)
+            waited += wait_seconds
+            wait_seconds = await self._run_blocking(limiter.reclaim_if_paused)
+        self.checker.metrics.observe('limiter_wait', waited)
+    
+    async def _request(self, path: str, params: Optional[Dict[str, str]] = None) -> AsyncResponse:
+        """
+        Send a rate-limited GET request, retrying according to the retry policy.
+        
+        Mirrors DarkWebChecker._request: a 429 pauses the limiter of the key
+        that got it and a key rejected with 401/403 is dropped from the pool.
+        
+        Args:
+            path (str): Path below the API base URL
+            params (Optional[Dict[str, str]]): Query parameters
+            
+        Returns:
+            AsyncResponse: Final response (possibly a 429/5xx once retries are exhausted)
+            
+        Raises:
+            OSError, asyncio.TimeoutError: If the network error persists
+            RuntimeError: If every key of the key pool has been rejected
+        """
+        import asyncio
+        
+        checker, metrics = self.checker, self.checker.metrics
+        attempt = 0
+        while True:
+            if checker.key_pool is not None:
+                slot, wait_seconds = await self._run_blocking(checker.key_pool.reserve)
+                limiter, headers = slot.rate_limiter, {'hibp-api-key': slot.api_key}
+            else:
+                slot, limiter, headers = None, checker.rate_limiter, None
+                wait_seconds = await self._run_blocking(limiter.reserve)
+            await self._wait_for_rate_limit(limiter, wait_seconds)
+            
+            started = time.perf_counter()
+            try:
+                response = await self.pool.get(path, params, headers)
+            except (OSError, asyncio.TimeoutError, asyncio.IncompleteReadError) as e:
+                metrics.observe('request', time.perf_counter() - started)
+                metrics.count('network_errors')
+                if not checker.retry_policy.allow(attempt):
+                    raise
+                delay = checker.retry_policy.delay(attempt)
+                logger.warning(f"Network error ({str(e) or type(e).__name__}). Retrying in {delay:.1f}s...")
+                await asyncio.sleep(delay)
+                metrics.count('retries')
+                attempt += 1
+                continue
+            metrics.observe('request', time.perf_counter() - started)
+            metrics.count_response(response.status_code)
+            
+            if slot is not None and response.status_code in (401, 403):
+                checker.key_pool.disable(slot, f"API error {response.status_code}")
+                metrics.count('keys_disabled')
+                continue
+            
+            if response.status_code not in RetryPolicy.RETRY_STATUSES:
+                return response
+            
+            retry = checker.retry_policy.allow(attempt)
+            delay = checker.retry_policy.delay(attempt, parse_retry_after(response.headers.get('retry-after')))
+            if response.status_code == 429:
+                # Pause even when not retrying, as in DarkWebChecker._request
+                owner = f"API key {slot.label}" if slot is not None else "all requests"
+                logger.warning(f"Rate limit exceeded by API. Pausing {owner} for {delay:.1f}s...")
+                await self._run_blocking(limiter.pause, delay)
+            if not retry:
+                return response
+            if response.status_code != 429:
+                logger.warning(f"API error {response.status_code}. Retrying in {delay:.1f}s...")
+                await asyncio.sleep(delay)
+            metrics.count('retries')
+            attempt += 1
+    
+    async def check_email(self, email: str, use_cache: bool = True) -> Dict[str, Any]:
+        """
+        Check if an email address has been involved in data breaches.
+        
+        Args:
+            email (str): Email address to check
+            use_cache (bool): Answer from the result cache when possible (default: True)
+            
+        Returns:
+            Dict[str, Any]: Result in the same format as DarkWebChecker.check_email_breach
+        """
+        import asyncio
+        
+        checker = self.checker
+        if checker.cache is not None and use_cache:
+            def cached_result() -> Optional[Dict[str, Any]]:
+                cached = checker.cache.get(email)
+                return cached if cached is not None and checker._adapt_cached(cached) else None
+            
+            cached = await self._run_blocking(cached_result)
+            if cached is not None:
+                return cached
+        
+        params = {'truncateResponse': 'true' if checker.catalog is not None else 'false'}
+        logger.info(f"Checking email: {email}")
+        try:
+            response = await self._request(f"/breachedaccount/{quote(email, safe='@')}", params)
+            # Decoding a large breach list would stall every other check on the loop
+            result = await self._run_blocking(checker._result_from_response, email, response)
+        except (OSError, asyncio.TimeoutError, asyncio.IncompleteReadError) as e:
+            error_msg = f"Network error: {str(e) or type(e).__name__}"
+            logger.error(error_msg)
+            result = {'email': email, 'status': 'error', 'error': error_msg,
+                      'checked_at': time.strftime('%Y-%m-%d %H:%M:%S')}
+        except RuntimeError as e:
+            logger.error(str(e))
+            result = {'email': email, 'status': 'error', 'error': str(e),
+                      'checked_at': time.strftime('%Y-%m-%d %H:%M:%S')}
+        except Exception as e:
+            error_msg = f"Unexpected error: {str(e)}"
+            logger.error(error_msg)
+            result = {'email': email, 'status': 'error', 'error': error_msg,
+                      'checked_at': time.strftime('%Y-%m-%d %H:%M:%S')}
+        if checker.cache is not None:
+            await self._run_blocking(checker.cache.put, result)
+        return result
+    
+    async def check_many(self, emails: Any, concurrency: int = 8,
+                         use_cache: bool = True) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Check many email addresses with several requests in flight.
+        
+        At most `concurrency` checks run at once and the input is consumed
+        only as fast as they finish. Closing the generator or cancelling the
+        task consuming it cancels the checks still in flight.
+        
+        Args:
+            emails (Iterable[str] or AsyncIterable[str]): Email addresses to check
+            concurrency (int): Number of concurrent checks (default: 8)
+            use_cache (bool): Answer from the result cache when possible (default: True)
+            
+        Yields:
+            Dict[str, Any]: Result of each check, in completion order
+        """
+        import asyncio
+        
+        is_async = hasattr(emails, '__aiter__')
+        source = emails.__aiter__() if is_async else iter(emails)
+        exhausted = False
+        pending = set()
+        try:
+            while True:
+                while not exhausted and len(pending) < concurrency:
+                    try:
+                        email = await source.__anext__() if is_async else next(source)
+                    except (StopIteration, StopAsyncIteration):
+                        exhausted = True
+                        break
+                    pending.add(asyncio.ensure_future(self.check_email(email, use_cache)))
+                if not pending:
+                    return
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    yield task.result()
+        finally:
+            for task in pending:
+                task.cancel()
+            if pending:
+                await asyncio.gather(*pending, return_exceptions=True)
+    
+    async def close(self):
+        """Close the pooled connections."""
+        if self._pool is not None:
+            await self._pool.close()
+    
+    async def __aenter__(self) -> 'AsyncDarkWebChecker':
+        return self
+    
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+class RangeCache:
+    """
+    Persistent SQLite cache of Pwned Passwords range responses keyed by hash prefix.
+    
+    Bodies are stored zlib-compressed; a prefix older than the TTL is fetched again.
+    """
+    
+    def __init__(self, path: str, ttl: float = 86400):
+        """
+        Open (or create) the cache database.
+        
+        Args:
+            path (str): Path of the SQLite database file
+            ttl (float): Seconds a cached range stays valid (default: 1 day)
+        """
+        self.path = path
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute('PRAGMA synchronous=NORMAL')
+        self._conn.execute(
+            'CREATE TABLE IF NOT EXISTS password_ranges ('
+            'prefix TEXT PRIMARY KEY, fetched_at REAL NOT NULL, body BLOB NOT NULL)'
+        )
+        self._conn.commit()
+    
+    def get(self, prefix: str) -> Optional[str]:
+        """
+        Look up a still-valid range response.
+        
+        Args:
+            prefix (str): Five-character SHA-1 prefix
+            
+        Returns:
+            Optional[str]: Range response body, or None if missing or expired
+        """
+        with self._lock:
+            row = self._conn.execute(
+                'SELECT fetched_at, body FROM password_ranges WHERE prefix = ?', (prefix,)
+            ).fetchone()
+        if row is None or time.time() - row[0] > self.ttl:
+            return None
+        return zlib.decompress(row[1]).decode('utf-8')
+    
+    def put(self, prefix: str, body: str):
+        """
+        Store a range response.
+        
+        Args:
+            prefix (str): Five-character SHA-1 prefix
+            body (str): Range response body
+        """
+        with self._lock:
+            self._conn.execute(
+                'INSERT OR REPLACE INTO password_ranges (prefix, fetched_at, body) VALUES (?, ?, ?)',
+                (prefix, time.time(), zlib.compress(body.encode('utf-8')))
+            )
+            self._conn.commit()
+    
+    def close(self):
+        """Close the underlying database connection."""
+        with self._lock:
+            self._conn.close()
+
+class PwnedPasswordsIndex:
+    """
+    Offline Pwned Passwords lookup on a sorted, memory-mapped binary index.
+    
+    The index holds fixed-size records of a 20-byte SHA-1 digest followed by
+    a 4-byte big-endian count, sorted by digest, so a lookup is a binary
+    search over the mapped file and nothing is loaded into memory up front.
+    Build it once from the downloaded ``HASH:COUNT`` text file with build().
+    """
+    
+    RECORD_SIZE = 24
+    
+    def __init__(self, index_path: str):
+        """
+        Open an index built with build().
+        
+        Args:
+            index_path (str): Path of the binary index
+        """
+        self.index_path = index_path
+        self._file = open(index_path, 'rb')
+        size = os.fstat(self._file.fileno()).st_size
+        if size % self.RECORD_SIZE:
+            self._file.close()
+            raise ValueError(f"Not a Pwned Passwords index: {index_path}")
+        self._count = size // self.RECORD_SIZE
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ) if size else b''
+    
+    @classmethod
+    def build(cls, text_path: str, index_path: str) -> int:
+        """
+        Convert a downloaded SHA-1 ``HASH:COUNT`` file into a binary index.
+        
+        The input must be ordered by hash, as the official download is; it is
+        streamed line by line, so building needs no more memory than a buffer.
+        
+        Args:
+            text_path (str): Downloaded text file (SHA-1, ordered by hash)
+            index_path (str): Path of the binary index to write
+            
+        Returns:
+            int: Number of records written
+        """
+        records = 0
+        previous = b''
+        temp_path = f"{index_path}.tmp"
+        with open(text_path, 'r', encoding='ascii') as source, open(temp_path, 'wb') as target:
+            for line_number, line in enumerate(source, 1):
+                line = line.strip()
+                if not line:
+                    continue
+                hash_hex, _, count = line.partition(':')
+                digest = bytes.fromhex(hash_hex)
+                if len(digest) != 20:
+                    raise ValueError(f"Line {line_number}: not a SHA-1 hash")
+                if digest <= previous:
+                    raise ValueError(f"Line {line_number}: input is not ordered by hash")
+                target.write(digest + int(count or 0).to_bytes(4, 'big'))
+                previous = digest
+                records += 1
+        os.replace(temp_path, index_path)
+        logger.info(f"Built Pwned Passwords index with {records} hashes at {index_path}")
+        return records
+    
+    def __len__(self) -> int:
+        return self._count
+    
+    def __getitem__(self, position: int) -> bytes:
+        """Return the digest of a record, which lets bisect search the index directly."""
+        offset = position * self.RECORD_SIZE
+        return self._map[offset:offset + 20]
+    
+    def lookup(self, sha1_hex: str) -> int:
+        """
+        Return how often a SHA-1 hash appears in breaches.
+        
+        Args:
+            sha1_hex (str): SHA-1 hash in hex
+            
+        Returns:
+            int: Breach count (0 if the hash is not in the index)
+            
+        Raises:
+            ValueError: If the value is not a 40-digit SHA-1 hash
+        """
+        digest = bytes.fromhex(sha1_hex)
+        if len(digest) != 20:
+            raise ValueError(f"Not a SHA-1 hash: {sha1_hex}")
+        position = bisect.bisect_left(self, digest)
+        if position < self._count and self[position] == digest:
+            offset = position * self.RECORD_SIZE + 20
+            return int.from_bytes(self._map[offset:offset + 4], 'big')
+        return 0
+    
+    def close(self):
+        """Unmap and close the index."""
+        if isinstance(self._map, mmap.mmap):
+            self._map.close()
+        self._file.close()
+
+class PwnedPasswordsChecker:
+    """
+    Check passwords against Pwned Passwords using the k-anonymity range API.
+    
+    Only the first five characters of each SHA-1 hash are sent. Hashes are
+    grouped by prefix, so each prefix is fetched once however many passwords
+    share it. With an offline index, no request is made at all.
+    """
+    
+    SHA1_PATTERN = re.compile(r'[0-9A-F]{40}')
+    
+    def __init__(self, cache: Optional[RangeCache] = None, index: Optional[PwnedPasswordsIndex] = None,
+                 retry_policy: Optional[RetryPolicy] = None):
+        """
+        Initialize the password checker.
+        
+        Args:
+            cache (Optional[RangeCache]): On-disk cache of range responses
+            index (Optional[PwnedPasswordsIndex]): Offline index; replaces the API when set
+            retry_policy (Optional[RetryPolicy]): Retry behavior for 429, 5xx and network errors
+        """
+        self.base_url = "https://api.pwnedpasswords.com"
+        self.cache = cache
+        self.index = index
+        self.retry_policy = retry_policy or RetryPolicy()
+        self._session = None
+    
+    @property
+    def session(self) -> 'requests.Session':
+        """HTTP session for range requests, created on first use."""
+        if self._session is None:
+            self._session = new_session({
+                'User-Agent': 'DarkWebChecker/1.0',
+                # Padded responses hide how many suffixes a prefix really has
+                'Add-Padding': 'true'
+            })
+        return self._session
+    
+    @staticmethod
+    def hash_password(password: str) -> str:
+        """
+        Return the uppercase SHA-1 hex digest of a password.
+        
+        Args:
+            password (str): Plain-text password
+            
+        Returns:
+            str: SHA-1 hash as used by Pwned Passwords
+        """
+        return hashlib.sha1(password.encode('utf-8')).hexdigest().upper()
+    
+    def fetch_range(self, prefix: str) -> Dict[str, int]:
+        """
+        Fetch the breached suffixes for a hash prefix, using the cache if possible.
+        
+        Args:
+            prefix (str): Five-character SHA-1 prefix
+            
+        Returns:
+            Dict[str, int]: Breach counts by 35-character suffix
+            
+        Raises:
+            requests.exceptions.RequestException: If the range cannot be fetched
+        """
+        import requests
+        
+        body = self.cache.get(prefix) if self.cache is not None else None
+        if body is None:
+            attempt = 0
+            while True:
+                try:
+                    response = self.session.get(f"{self.base_url}/range/{prefix}", timeout=30)
+                except (requests.exceptions.ConnectionError, requests.exceptions.Timeout):
+                    if not self.retry_policy.allow(attempt):
+                        raise
+                    time.sleep(self.retry_policy.delay(attempt))
+                    attempt += 1
+                    continue
+                if response.status_code in RetryPolicy.RETRY_STATUSES and self.retry_policy.allow(attempt):
+                    time.sleep(self.retry_policy.delay(attempt, parse_retry_after(response.headers.get('Retry-After'))))
+                    attempt += 1
+                    continue
+                response.raise_for_status()
+                body = response.text
+                break
+            if self.cache is not None:
+                self.cache.put(prefix, body)
+        
+        suffixes = {}
+        for line in body.splitlines():
+            suffix, _, count = line.partition(':')
+            if count and int(count):  # Padding entries have a count of 0
+                suffixes[suffix.strip()] = int(count)
+        return suffixes
+    
+    def check_hashes(self, hashes: Iterable[str], max_workers: int = 8) -> Iterator[Dict[str, Any]]:
+        """
+        Check SHA-1 hashes, fetching each distinct prefix only once.
+        
+        Args:
+            hashes (Iterable[str]): SHA-1 hashes in hex
+            max_workers (int): Number of prefixes fetched concurrently (default: 8)
+            
+        Yields:
+            Dict[str, Any]: One result per hash, grouped by prefix; values that are
+                not 40-digit SHA-1 hashes get an error result instead of a lookup
+        """
+        by_prefix: Dict[str, List[str]] = {}
+        for sha1 in hashes:
+            sha1 = sha1.strip().upper()
+            if not self.SHA1_PATTERN.fullmatch(sha1):
+                # A truncated hash would otherwise be reported as safe
+                logger.error(f"Not a SHA-1 hash: {sha1}")
+                yield {'sha1': sha1, 'status': 'error', 'error': "Not a SHA-1 hash",
+                       'checked_at': time.strftime('%Y-%m-%d %H:%M:%S')}
+                continue
+            by_prefix.setdefault(sha1[:5], []).append(sha1)
+        
+        if self.index is not None:
+            for sha1_list in by_prefix.values():
+                for sha1 in sha1_list:
+                    yield self._result(sha1, self.index.lookup(sha1))
+            return
+        
+        import requests
+        from concurrent.futures import ThreadPoolExecutor
+        
+        logger.info(f"Checking {sum(map(len, by_prefix.values()))} hashes across {len(by_prefix)} prefixes")
+        with ThreadPoolExecutor(max_workers=max(1, max_workers), thread_name_prefix='dwc-range') as executor:
+            futures = {executor.submit(self.fetch_range, prefix): prefix for prefix in by_prefix}
+            for future in futures:
+                prefix = futures[future]
+                try:
+                    suffixes = future.result()
+                except requests.exceptions.RequestException as e:
+                    error_msg = f"Network error: {str(e)}"
+                    logger.error(error_msg)
+                    for sha1 in by_prefix[prefix]:
+                        yield {'sha1': sha1, 'status': 'error', 'error': error_msg,
+                               'checked_at': time.strftime('%Y-%m-%d %H:%M:%S')}
+                    continue
+                for sha1 in by_prefix[prefix]:
+                    yield self._result(sha1, suffixes.get(sha1[5:], 0))
+    
+    def check_passwords(self, passwords: Iterable[str], max_workers: int = 8) -> Iterator[Dict[str, Any]]:
+        """
+        Check plain-text passwords; only their hashes appear in the results.
+        
+        Args:
+            passwords (Iterable[str]): Plain-text passwords
+            max_workers (int): Number of prefixes fetched concurrently (default: 8)
+            
+        Returns:
+            Iterator[Dict[str, Any]]: One result per password
+        """
+        return self.check_hashes((self.hash_password(password) for password in passwords), max_workers)
+    
+    @staticmethod
+    def _result(sha1: str, count: int) -> Dict[str, Any]:
+        """Build the result for a hash and its breach count."""
+        return {
+            'sha1': sha1,
+            'status': 'pwned' if count else 'safe',
+            'count': count,
+            'checked_at': time.strftime('%Y-%m-%d %H:%M:%S')
+        }
+
+def run_password_check(args: argparse.Namespace):
+    """
+    Run the Pwned Passwords mode of the command line tool.
+    
+    Args:
+        args (argparse.Namespace): Parsed command line arguments
+    """
+    if args.build_password_index:
+        source, _, index_path = args.build_password_index.partition(':')
+        index_path = index_path or args.password_index or 'pwned_passwords.idx'
+        print(f"🔨 Building password index {index_path} from {source}...")
+        records = PwnedPasswordsIndex.build(source, index_path)
+        print(f"✅ Indexed {records} hashes")
+        if not args.passwords:
+            return
+    
+    if not os.path.exists(args.passwords):
+        print(f"❌ File not found: {args.passwords}")
+        sys.exit(1)
+    
+    output_file = args.output or 'password_results.csv'
+    file_ext = Path(output_file).suffix.lower()
+    if file_ext not in ('.csv', '.json', '.jsonl', '.ndjson'):
+        raise ValueError(f"Unsupported output format for password results: {file_ext or output_file} "
+                         f"(use .csv, .json, .jsonl or .ndjson)")
+    
+    index = PwnedPasswordsIndex(args.password_index) if args.password_index else None
+    cache = RangeCache(args.cache, ttl=parse_duration(args.max_age)) if args.cache and index is None else None
+    checker = PwnedPasswordsChecker(cache=cache, index=index,
+                                    retry_policy=RetryPolicy(max_retries=args.max_retries, budget=args.retry_budget))
+    
+    counts = {'pwned': 0, 'safe': 0, 'error': 0}
+    is_csv = file_ext == '.csv'
+    with open(args.passwords, 'r', encoding='utf-8') as source, \
+            open(output_file, 'w', newline='' if is_csv else None, encoding='utf-8') as f:
+        values = (line.rstrip('\r\n') for line in source if line.strip())
+        check = checker.check_hashes if args.hashed_input else checker.check_passwords
+        writer = None
+        if is_csv:
+            writer = csv.DictWriter(f, fieldnames=['sha1', 'status', 'count', 'checked_at'], extrasaction='ignore')
+            writer.writeheader()
+        elif file_ext == '.json':
+            # Streamed as the items of one JSON array
+            f.write('[')
+        # Range requests need no API key and are not rate limited, so default to several
+        for result in check(values, max_workers=args.workers if args.workers is not None else 8):
+            if writer is not None:
+                writer.writerow(result)
+            elif file_ext == '.json':
+                f.write(('\n  ' if not any(counts.values()) else ',\n  ') + json.dumps(result))
+            else:
+                f.write(json.dumps(result) + '\n')
+            counts[result['status']] += 1
+        if file_ext == '.json':
+            f.write('\n]\n' if any(counts.values()) else ']\n')
+    
+    if cache is not None:
+        cache.close()
+    if index is not None:
+        index.close()
+    
+    print(f"\n📊 Summary:")
+    print(f"   Total passwords checked: {sum(counts.values())}")
+    print(f"   🚨 Found in breaches: {counts['pwned']}")
+    print(f"   ✅ Not found: {counts['safe']}")
+    print(f"   ❌ Errors: {counts['error']}")
+    print(f"   📄 Results saved to: {output_file}")
+
+def run_watch(checker: DarkWebChecker, emails: Iterable[str], args: argparse.Namespace, output_file: str):
+    """
+    Run the watch (delta) mode of the command line tool.
+    
+    Args:
+        checker (DarkWebChecker): Configured checker
+        emails (Iterable[str]): Email addresses to watch
+        args (argparse.Namespace): Parsed command line arguments
+        output_file (str): Report file path
+    """
+    import requests
+    
+    state = WatchState(args.watch)
+    try:
+        report = checker.watch(emails, state, max_workers=args.workers)
+    except (requests.exceptions.RequestException, ValueError) as e:
+        print(f"❌ Could not download the breach catalog: {e}")
+        sys.exit(1)
+    finally:
+        state.close()
+    checker.save_watch_report(report, output_file)
+    if checker.cache is not None:
+        checker.cache.close()
+    if args.stats_file:
+        checker.metrics.write_json(args.stats_file)
+    
+    affected = sum(bool(change['added']) for change in report['changes'])
+    print(f"\n📊 Watch Summary:")
+    if report['since'] is None:
+        print(f"   📌 First run: baseline recorded in {args.watch}")
+    else:
+        new_breaches = report['new_breaches']
+        listed = ', '.join(new_breaches[:10]) + (', ...' if len(new_breaches) > 10 else '')
+        print(f"   🆕 Breaches added since {report['since']}: {len(new_breaches)}"
+              + (f" ({listed})" if new_breaches else ""))
+    print(f"   🔍 Re-checked: {report['rechecked']}")
+    print(f"   💤 Skipped (no new breach since last check): {report['unchanged']}")
+    print(f"   ❌ Errors: {report['errors']}")
+    print(f"   🚨 Addresses with new breaches: {affected}")
+    print(f"   📄 Report saved to: {output_file}")
+
 def get_api_key() -> str:
     """Get API key from environment variable or user input."""
     api_key = os.getenv('HIBP_API_KEY')
@@ -346,54 +3623,251 @@ def main():
 Examples:
   python dark_web_checker.py -f emails.txt -o results.json
   python dark_web_checker.py -e user@example.com -o results.csv
+  python -m dark_web_checker -e user@example.com -o result.json --cache
   python dark_web_checker.py --file emails.csv --output results.txt --hourly-limit 50
   python dark_web_checker.py -f emails.txt -o results.json --request-delay 2.0
+  python dark_web_checker.py -f emails.txt -o results.json --workers 8 --requests-per-minute 100
+  python dark_web_checker.py -f emails.txt -o results.json --cache --max-age 1d --found-max-age 7d
+  python dark_web_checker.py -f emails.txt -o results.json --breach-catalog
+  python dark_web_checker.py -f export.jsonl -o results.json --bloom-dedupe 5000000
+  python dark_web_checker.py -f emails.txt -o results.jsonl --resume
+  python dark_web_checker.py -f staff.csv -o results.jsonl --domain-search company.com,company.org
+  python dark_web_checker.py --passwords passwords.txt -o password_results.csv --cache
+  python dark_web_checker.py -f emails.txt -o results.jsonl --api-keys KEY1:100,KEY2:10 --workers 16
+  python dark_web_checker.py -f emails.txt -o shard1.jsonl --shard 1/4 --shared-limiter limiter.db
+  python dark_web_checker.py --merge shard1.jsonl shard2.jsonl shard3.jsonl shard4.jsonl -o results.csv
+  python dark_web_checker.py -f emails.txt -o changes.json --watch
+  python dark_web_checker.py -f emails.txt -o results.dwc --breach-catalog
+  python dark_web_checker.py --build-password-index pwned-passwords-sha1.txt:pwned.idx
+  python dark_web_checker.py --passwords hashes.txt --hashed-input --password-index pwned.idx
         """
     )
     
-    parser.add_argument('-f', '--file', type=str, help='Input file containing email addresses (txt, csv, json)')
+    parser.add_argument('-f', '--file', type=str, help='Input file containing email addresses (txt, csv, json, jsonl)')
     parser.add_argument('-e', '--email', type=str, help='Single email address to check')
-    parser.add_argument('-o', '--output', type=str, help='Output file for results (txt, csv, json)')
+    parser.add_argument('-o', '--output', type=str,
+                       help='Output file for results (txt, csv, json, jsonl) or .dwc directory; '
+                            'csv, jsonl and .dwc are written incrementally')
     parser.add_argument('--api-key', type=str, help='Have I Been Pwned API key')
+    parser.add_argument('--api-keys', type=str, default=None, metavar='KEY[:RPM],...',
+                       help='Several API keys to spread requests over, each optionally with its '
+                            'requests-per-minute limit (default rate: --requests-per-minute)')
     parser.add_argument('-v', '--verbose', action='store_true', help='Enable verbose logging')
+    parser.add_argument('--log-file', type=str, nargs='?', const='dark_web_checker.log', default=None,
+                       metavar='PATH', help='Also write the log to PATH (default: dark_web_checker.log, '
+                                            'which file and interactive runs always write)')
+    parser.add_argument('--banner', action='store_true',
+                       help='Show the banner and rate limiting settings for single email checks too')
     parser.add_argument('--hourly-limit', type=int, default=100, 
                        help='Maximum requests per hour (default: 100)')
     parser.add_argument('--request-delay', type=float, default=1.6,
                        help='Delay between requests in seconds (default: 1.6)')
+    parser.add_argument('--requests-per-minute', type=float, default=None,
+                       help='Per-minute request limit of your API key (overrides --request-delay)')
+    parser.add_argument('-w', '--workers', type=int, default=None,
+                       help='Number of concurrent requests (default: 1, or 8 with --passwords)')
+    parser.add_argument('--cache', nargs='?', const='dark_web_checker_cache.db', default=None,
+                       metavar='PATH',
+                       help='Reuse results from a local cache (default path: dark_web_checker_cache.db)')
+    parser.add_argument('--max-age', type=str, default='1d',
+                       help='How long cached results stay valid, e.g. 3600, 30m, 12h, 7d (default: 1d)')
+    parser.add_argument('--found-max-age', type=str, default=None,
+                       help='Cache validity for emails found in breaches (default: --max-age)')
+    parser.add_argument('--clean-max-age', type=str, default=None,
+                       help='Cache validity for clean emails (default: --max-age)')
+    parser.add_argument('--breach-catalog', nargs='?', const='breach_catalog.json', default=None,
+                       metavar='PATH',
+                       help='Store breach details once in a shared catalog instead of per email '
+                            '(default path: breach_catalog.json)')
+    parser.add_argument('--catalog-max-age', type=str, default='1d',
+                       help='How long the local breach catalog stays valid (default: 1d)')
+    parser.add_argument('--bloom-dedupe', type=int, default=None, metavar='EXPECTED_EMAILS',
+                       help='Deduplicate input with a Bloom filter sized for this many addresses '
+                            '(bounded memory, may skip ~0.1%% of unique addresses)')
+    parser.add_argument('--column', type=str, default=None, metavar='NAME',
+                       help='Only read addresses from this CSV column (header name or 1-based position)')
+    parser.add_argument('--json-path', type=str, default=None, metavar='PATH',
+                       help="Only read addresses from this field of JSON/JSON Lines input (e.g. 'users.*.email')")
+    parser.add_argument('--dedupe-plus-tags', action='store_true',
+                       help="Treat addresses differing only in a '+tag' (user+news@...) as duplicates")
+    parser.add_argument('--dedupe-gmail-dots', action='store_true',
+                       help='Treat Gmail addresses differing only in dots (j.doe@gmail.com) as duplicates')
+    parser.add_argument('--table-format', choices=ColumnarWriter.FORMATS, default='jsonl',
+                       help='Table format of .dwc outputs: gzip-compressed JSON lines (default) '
+                            'or Parquet (requires pyarrow)')
+    parser.add_argument('--resume', action='store_true',
+                       help='Append to an existing csv/jsonl output and skip emails already recorded in it')
+    parser.add_argument('--max-retries', type=int, default=5,
+                       help='Retries per request on 429, 5xx and network errors (default: 5)')
+    parser.add_argument('--retry-budget', type=int, default=None,
+                       help='Maximum retries for the whole run (default: unlimited)')
+    parser.add_argument('--passwords', type=str, default=None, metavar='FILE',
+                       help='Check the passwords in FILE (one per line) against Pwned Passwords '
+                            'instead of checking emails; no API key needed')
+    parser.add_argument('--hashed-input', action='store_true',
+                       help='Lines of the --passwords file are SHA-1 hashes, not plain-text passwords')
+    parser.add_argument('--password-index', type=str, default=None, metavar='PATH',
+                       help='Check passwords offline against an index built with --build-password-index')
+    parser.add_argument('--build-password-index', type=str, default=None, metavar='TEXTFILE[:INDEX]',
+                       help='Build an offline index from the downloaded SHA-1 Pwned Passwords file '
+                            '(default index path: --password-index or pwned_passwords.idx)')
+    parser.add_argument('--shard', type=str, default=None, metavar='I/N',
+                       help='Only check the addresses of shard I out of N (e.g. 2/4), '
+                            'assigned by consistent hashing')
+    parser.add_argument('--shared-limiter', type=str, default=None, metavar='PATH',
+                       help='SQLite file holding the rate limit state shared by all shard processes')
+    parser.add_argument('--merge', type=str, nargs='+', default=None, metavar='FILE',
+                       help='Merge JSON-lines result files (e.g. one per shard) into --output and exit')
+    parser.add_argument('--watch', nargs='?', const='dark_web_checker_watch.db', default=None, metavar='STATE',
+                       help='Watch mode: only re-check addresses a newly added breach could affect and write '
+                            'a report of the changes (state kept in STATE, default: dark_web_checker_watch.db)')
+    parser.add_argument('--progress-interval', type=float, default=30, metavar='SECONDS',
+                       help='Print a progress line with throughput and ETA this often (default: 30, 0 disables)')
+    parser.add_argument('--stats-file', type=str, default=None, metavar='PATH',
+                       help='Write run statistics (counters, stage times, latency percentiles) as JSON at the end')
+    parser.add_argument('--metrics-file', type=str, default=None, metavar='PATH',
+                       help='Keep a Prometheus text-format metrics file up to date during the run')
+    parser.add_argument('--domain-search', type=str, default=None, metavar='DOMAINS',
+                       help='Comma-separated domains verified for your API key; their emails are '
+                            'checked with one breached-domain request per domain')
     
     args = parser.parse_args()
     
+    # Single email checks are often run from hooks and scripts: keep them quiet and
+    # fast unless the banner or a log file is asked for
+    single_check = bool(args.email) and not args.file
+    show_banner = args.banner or not single_check
+    log_file = args.log_file or (None if single_check else 'dark_web_checker.log')
+    
+    # Load environment variables from .env file
+    from dotenv import load_dotenv
+    load_dotenv()
+    
+    # Configure logging
+    handlers = [logging.StreamHandler(sys.stdout)]
+    if log_file:
+        handlers.insert(0, logging.FileHandler(log_file))
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(levelname)s - %(message)s',
+        handlers=handlers
+    )
+    
     if args.verbose:
         logging.getLogger().setLevel(logging.DEBUG)
     
+    if args.passwords or args.build_password_index:
+        try:
+            run_password_check(args)
+        except (OSError, ValueError) as e:
+            print(f"❌ {e}")
+            sys.exit(1)
+        return
+    
+    if args.workers is None:
+        args.workers = 1
+    
     # Get rate limiting configuration from environment or use defaults
     hourly_limit = int(os.getenv('HIBP_HOURLY_LIMIT', args.hourly_limit))
     request_delay = float(os.getenv('HIBP_REQUEST_DELAY', args.request_delay))
+    requests_per_minute = os.getenv('HIBP_REQUESTS_PER_MINUTE', args.requests_per_minute)
+    requests_per_minute = float(requests_per_minute) if requests_per_minute else None
+    
+    # Open the result cache if requested
+    cache = None
+    if args.cache:
+        try:
+            max_age = parse_duration(args.max_age)
+            cache = ResultCache(
+                args.cache,
+                found_ttl=parse_duration(args.found_max_age) if args.found_max_age else max_age,
+                clean_ttl=parse_duration(args.clean_max_age) if args.clean_max_age else max_age
+            )
+        except ValueError as e:
+            print(f"❌ {e}")
+            sys.exit(1)
+    
+    catalog = None
+    if args.breach_catalog:
+        try:
+            catalog = BreachCatalog(args.breach_catalog, max_age=parse_duration(args.catalog_max_age))
+        except ValueError as e:
+            print(f"❌ {e}")
+            sys.exit(1)
+    
+    shard_index = shard_count = None
+    if args.shard:
+        try:
+            index, _, count = args.shard.partition('/')
+            shard_index, shard_count = int(index) - 1, int(count)
+            if not 0 <= shard_index < shard_count:
+                raise ValueError
+        except ValueError:
+            print(f"❌ Invalid shard {args.shard!r}, expected I/N with 1 <= I <= N (e.g. 2/4)")
+            sys.exit(1)
     
     # Initialize checker
-    checker = DarkWebChecker("", hourly_limit=hourly_limit, request_delay=request_delay)
-    checker.display_banner()
+    checker = DarkWebChecker("", hourly_limit=hourly_limit, request_delay=request_delay,
+                             requests_per_minute=requests_per_minute, cache=cache, catalog=catalog,
+                             retry_policy=RetryPolicy(max_retries=args.max_retries, budget=args.retry_budget))
+    if args.shared_limiter:
+        checker.rate_limiter = SharedRateLimiter.for_api_key(
+            args.shared_limiter, checker.requests_per_minute, hourly_limit)
     
-    # Display rate limiting info
-    print(f"⚙️  Rate limiting: {hourly_limit} requests/hour, {request_delay}s delay between requests\n")
+    if args.merge:
+        output_file = args.output or 'results.json'
+        try:
+            merged = checker.merge_results(args.merge, output_file)
+        except (OSError, ValueError) as e:
+            print(f"❌ {e}")
+            sys.exit(1)
+        print(f"📄 Merged {merged} results from {len(args.merge)} file(s) into {output_file}")
+        return
+    if show_banner:
+        checker.display_banner()
+        
+        # Display rate limiting info
+        print(f"⚙️  Rate limiting: {hourly_limit} requests/hour, "
+              f"{checker.requests_per_minute:g} requests/minute, {args.workers} worker(s)\n")
     
-    # Get API key
-    api_key = args.api_key or get_api_key()
+    # Get API key(s)
+    pooled_keys = args.api_keys or os.getenv('HIBP_API_KEYS')
+    if pooled_keys:
+        try:
+            keys = []
+            for entry in pooled_keys.split(','):
+                key, _, rpm = entry.strip().partition(':')
+                if key:
+                    keys.append((key, float(rpm) if rpm else checker.requests_per_minute))
+            checker.key_pool = KeyPool.from_keys(keys, hourly_limit=hourly_limit,
+                                                 shared_state=args.shared_limiter)
+        except ValueError as e:
+            print(f"❌ Invalid --api-keys value: {e}")
+            sys.exit(1)
+        api_key = keys[0][0]
+        print(f"🔑 Using a pool of {len(keys)} API keys "
+              f"({sum(rpm for _, rpm in keys):g} requests/minute combined)")
+    else:
+        api_key = args.api_key or get_api_key()
     if not api_key:
         print("❌ API key is required to use this tool.")
         sys.exit(1)
     
+    # The session is created on first request, so it picks up the key set here
     checker.api_key = api_key
-    checker.session.headers.update({'hibp-api-key': api_key})
     
-    # Get emails to check
+    # Get emails to check; files are streamed so checking starts on the first address
     emails = []
+    input_progress = InputProgress()
+    extraction = dict(bloom_capacity=args.bloom_dedupe, column=args.column, json_path=args.json_path,
+                      strip_plus=args.dedupe_plus_tags, gmail_dots=args.dedupe_gmail_dots,
+                      progress=input_progress)
     
     if args.file:
         if not os.path.exists(args.file):
             print(f"❌ File not found: {args.file}")
             sys.exit(1)
-        emails = checker.load_emails_from_file(args.file)
+        emails = checker.iter_emails_from_file(args.file, **extraction)
     elif args.email:
         if checker.is_valid_email(args.email):
             emails = [args.email]
@@ -415,11 +3889,23 @@ Examples:
             if not os.path.exists(file_path):
                 print(f"❌ File not found: {file_path}")
                 sys.exit(1)
-            emails = checker.load_emails_from_file(file_path)
+            emails = checker.iter_emails_from_file(file_path, **extraction)
     
-    if not emails:
+    total = len(emails) if isinstance(emails, list) else None
+    emails = iter(emails)
+    if shard_count:
+        emails = (email for email in emails if shard_for_email(email, shard_count) == shard_index)
+        total = None
+        print(f"🧩 Checking shard {shard_index + 1} of {shard_count}")
+    try:
+        first_email = next(emails, None)
+    except ValueError as e:
+        print(f"❌ {e}")
+        sys.exit(1)
+    if first_email is None:
         print("❌ No valid email addresses found.")
         sys.exit(1)
+    emails = chain([first_email], emails)
     
     # Get output file
     output_file = args.output
@@ -428,32 +3914,98 @@ Examples:
         if not output_file:
             output_file = "results.json"
     
+    if args.watch:
+        if args.resume or args.domain_search:
+            print("❌ --watch cannot be combined with --resume or --domain-search.")
+            sys.exit(1)
+        run_watch(checker, emails, args, output_file)
+        return
+    
+    # Stream results to disk as they complete when the output format allows it
+    streaming = checker.supports_streaming(output_file)
+    if args.resume:
+        if not streaming:
+            print("❌ --resume requires a .jsonl, .ndjson, .csv or .dwc output.")
+            sys.exit(1)
+        recorded = ResultWriter.read_recorded_emails(output_file)
+        if recorded:
+            print(f"⏩ Resuming: skipping {len(recorded)} email(s) already in {output_file}")
+            emails = (email for email in emails if normalize_email(email) not in recorded)
+    writer = None
+    if streaming:
+        try:
+            writer = checker.open_result_writer(output_file, append=args.resume, table_format=args.table_format)
+        except ValueError as e:
+            print(f"❌ {e}")
+            sys.exit(1)
+    
     # Check emails
-    print(f"\n🔍 Checking {len(emails)} email address(es)...")
+    print(f"\n🔍 Checking {total if total else 'streamed'} email address(es)...")
     results = []
+    metrics = checker.metrics
+    next_report = time.monotonic() + args.progress_interval
     
-    for i, email in enumerate(emails, 1):
-        print(f"[{i}/{len(emails)}] Checking: {email}")
-        result = checker.check_email_breach(email)
-        results.append(result)
-        
-        # Apply request delay between emails (except for the last one)
-        if i < len(emails):
-            time.sleep(checker.request_delay)
+    def report(done: int):
+        if args.progress_interval > 0:
+            print(metrics.progress_line(done, total, input_progress.fraction))
+        if args.metrics_file:
+            metrics.write_prometheus(args.metrics_file)
+    
+    # Request spacing is enforced by the shared rate limiter, no extra sleep needed
+    done = 0
+    try:
+        if args.domain_search:
+            checks = checker.check_many_by_domain(emails, args.domain_search.split(','), max_workers=args.workers)
+        else:
+            # A single address needs no worker threads
+            checks = checker.check_many(emails, max_workers=1 if total == 1 else args.workers)
+        for done, result in enumerate(checks, 1):
+            progress = f"{done}/{total}" if total else str(done)
+            print(f"[{progress}] Checked: {result['email']} ({result['status']})")
+            metrics.count_result(result)
+            if writer is not None:
+                started = time.perf_counter()
+                writer.write(result)
+                metrics.observe('write', time.perf_counter() - started)
+            else:
+                results.append(result)
+            if (args.progress_interval > 0 or args.metrics_file) and time.monotonic() >= next_report:
+                report(done)
+                next_report = time.monotonic() + (args.progress_interval or 30)
+    finally:
+        if writer is not None:
+            writer.close()
     
     # Save results
-    checker.save_results(results, output_file)
+    if writer is None:
+        started = time.perf_counter()
+        checker.save_results(results, output_file)
+        metrics.observe('write', time.perf_counter() - started)
+    if cache is not None:
+        cache.close()
+    if args.metrics_file:
+        metrics.write_prometheus(args.metrics_file)
+    if args.stats_file:
+        metrics.write_json(args.stats_file)
     
     # Summary
-    found_breaches = sum(1 for r in results if r['status'] == 'found')
-    clean_emails = sum(1 for r in results if r['status'] == 'clean')
-    errors = sum(1 for r in results if r['status'] == 'error')
+    counts = metrics.results
+    found_breaches = counts.get('found', 0)
     
     print(f"\n📊 Summary:")
-    print(f"   Total emails checked: {len(emails)}")
+    print(f"   Total emails checked: {done}")
     print(f"   🚨 Found in breaches: {found_breaches}")
-    print(f"   ✅ Clean: {clean_emails}")
-    print(f"   ❌ Errors: {errors}")
+    print(f"   ✅ Clean: {counts.get('clean', 0)}")
+    print(f"   ❌ Errors: {counts.get('error', 0)}")
+    if cache is not None:
+        print(f"   💾 From cache: {metrics.counters['cache_hits']}")
+    if metrics.responses.get(429):
+        print(f"   🐢 Rate limited by API (429): {metrics.responses[429]}")
+    print(f"   ⏱️  Time: {format_seconds(metrics.elapsed())} total; limiter "
+          f"{format_seconds(metrics.stage_seconds('limiter_wait'))}, network "
+          f"{format_seconds(metrics.stage_seconds('request'))}, parsing "
+          f"{format_seconds(metrics.stage_seconds('parse'))}, writing "
+          f"{format_seconds(metrics.stage_seconds('write'))}")
     print(f"   📄 Results saved to: {output_file}")
     
     if found_breaches > 0:
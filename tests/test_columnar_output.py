@@ -0,0 +1,89 @@
+"""Tests for the compact columnar '.dwc' output."""
+
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from dark_web_checker import ColumnarResults, ColumnarWriter, ResultWriter
+
+BREACHES = [{'Name': 'Adobe', 'BreachDate': '2013-10-04'}, {'Name': 'LinkedIn', 'BreachDate': '2012-05-05'}]
+
+
+def write_results(path, table_format):
+    with ColumnarWriter(path, table_format=table_format) as writer:
+        writer.write({'email': 'found@example.com', 'status': 'found', 'breach_count': 2,
+                      'breaches': BREACHES, 'checked_at': '2024-01-15 10:30:45'})
+        writer.write({'email': 'clean@example.com', 'status': 'clean', 'breach_count': 0,
+                      'breaches': [], 'checked_at': '2024-01-15 10:30:46'})
+        writer.write({'email': 'error@example.com', 'status': 'error', 'error': 'Network error: timeout',
+                      'checked_at': '2024-01-15 10:30:47'})
+
+
+@pytest.mark.parametrize('table_format', ['jsonl', 'parquet'])
+def test_round_trip(tmp_path, table_format):
+    if table_format == 'parquet':
+        pytest.importorskip('pyarrow')
+    path = str(tmp_path / 'results.dwc')
+    write_results(path, table_format)
+
+    results = ColumnarResults(path)
+    assert results.status_counts() == {'found': 1, 'clean': 1, 'error': 1}
+    assert results.breach_counts() == {'Adobe': 1, 'LinkedIn': 1}
+    assert list(results.emails_in_breach('Adobe')) == ['found@example.com']
+    assert results.catalog['Adobe']['BreachDate'] == '2013-10-04'
+    assert list(results.iter_results(('error',))) == [
+        {'email': 'error@example.com', 'status': 'error', 'checked_at': '2024-01-15 10:30:47',
+         'error': 'Network error: timeout'}]
+
+
+def test_interrupted_parquet_table_is_reported(tmp_path):
+    pytest.importorskip('pyarrow')
+    path = str(tmp_path / 'results.dwc')
+    writer = ColumnarWriter(path, table_format='parquet')
+    for i in range(ColumnarWriter.FLUSH_EVERY + 1):
+        writer.write({'email': f'user{i}@example.com', 'status': 'clean', 'breach_count': 0,
+                      'breaches': [], 'checked_at': '2024-01-15 10:30:45'})
+
+    # Never closed, as after a crash: the Parquet footer is missing
+    with pytest.raises(ValueError, match='Incomplete Parquet table'):
+        ColumnarResults(path).status_counts()
+    writer.close()
+
+
+def test_block_cut_by_crash_is_checked_again_on_resume(tmp_path):
+    path = str(tmp_path / 'results.dwc')
+    emails = [f'user{i}@example.com' for i in range(ColumnarWriter.FLUSH_EVERY + 3)]
+    with ColumnarWriter(path) as writer:
+        for email in emails:
+            writer.write({'email': email, 'status': 'clean', 'breach_count': 0,
+                          'breaches': [], 'checked_at': '2024-01-15 10:30:45'})
+    # Cut off the gzip trailer of the last block; its rows still decompress
+    results_path = os.path.join(path, 'results.jsonl.gz')
+    with open(results_path, 'rb+') as f:
+        f.truncate(os.path.getsize(results_path) - 4)
+
+    recorded = ResultWriter.read_recorded_emails(path)
+    assert recorded == set(emails[:ColumnarWriter.FLUSH_EVERY])
+
+    with ColumnarWriter(path, append=True) as writer:
+        for email in emails:
+            if email not in recorded:
+                writer.write({'email': email, 'status': 'clean', 'breach_count': 0,
+                              'breaches': [], 'checked_at': '2024-01-15 10:31:45'})
+
+    assert sorted(row['email'] for row in ColumnarResults(path).iter_results()) == sorted(emails)
+
+
+def test_resumed_error_counts_once(tmp_path):
+    path = str(tmp_path / 'results.dwc')
+    with ColumnarWriter(path) as writer:
+        writer.write({'email': 'a@example.com', 'status': 'error', 'error': 'Network error: timeout',
+                      'checked_at': '2024-01-15 10:30:45'})
+    with ColumnarWriter(path, append=True) as writer:
+        writer.write({'email': 'a@example.com', 'status': 'found', 'breach_count': 1,
+                      'breaches': BREACHES[:1], 'checked_at': '2024-01-15 10:31:45'})
+
+    assert ColumnarResults(path).status_counts() == {'found': 1}
@@ -0,0 +1,94 @@
+"""Regression tests for parallel checks and the shared rate limiter."""
+
+import os
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from dark_web_checker import DarkWebChecker, SlidingWindowLimiter
+
+
+class FakeResponse:
+    def __init__(self, status_code, headers=None):
+        self.status_code = status_code
+        self.headers = headers or {}
+        self.text = ''
+
+    def json(self):
+        return []
+
+
+class FakeSession:
+    """Answers every breachedaccount request with 404 and records when it was sent."""
+
+    def __init__(self):
+        self.sent = []
+        self._lock = threading.Lock()
+
+    def mount(self, prefix, adapter):
+        pass
+
+    def get(self, url, params=None, timeout=None):
+        with self._lock:
+            self.sent.append(time.monotonic())
+        return FakeResponse(404)
+
+
+def make_checker(spacing=0.05):
+    checker = DarkWebChecker("test-key", rate_limiter=SlidingWindowLimiter([(1, spacing)]))
+    checker._session = FakeSession()
+    return checker
+
+
+def test_checks_after_parallel_run_are_not_cancelled():
+    checker = make_checker()
+    emails = [f'u{i}@example.com' for i in range(6)]
+
+    first = list(checker.check_many(emails, max_workers=3))
+    # Both of these have to wait on the limiter after the parallel run
+    single = checker.check_email_breach('d@example.com', use_cache=False)
+    sequential = list(checker.check_many(emails[:2], max_workers=1))
+    second = list(checker.check_many(emails, max_workers=3))
+
+    for result in first + [single] + sequential + second:
+        assert result['status'] == 'clean', result
+
+
+def test_closing_parallel_run_cancels_waiting_workers():
+    checker = make_checker(spacing=5)
+    results = checker.check_many([f'u{i}@example.com' for i in range(4)], max_workers=4)
+
+    started = time.monotonic()
+    assert next(results)['status'] == 'clean'
+    results.close()
+
+    assert time.monotonic() - started < 2
+
+
+def test_waiters_resume_at_normal_spacing_after_pause():
+    spacing = 0.2
+    checker = make_checker(spacing)
+    limiter = checker.rate_limiter
+    sent = []
+    lock = threading.Lock()
+
+    def worker():
+        checker._wait_for_rate_limit()
+        with lock:
+            sent.append(time.monotonic())
+
+    threads = [threading.Thread(target=worker) for _ in range(6)]
+    for thread in threads:
+        thread.start()
+    time.sleep(0.05)
+    # As after a 429 with Retry-After while five workers hold reserved slots
+    limiter.pause(0.6)
+    paused_until = time.monotonic() + 0.6
+    for thread in threads:
+        thread.join()
+
+    sent.sort()
+    assert all(t >= paused_until - 0.01 for t in sent[1:])
+    assert min(b - a for a, b in zip(sent[1:], sent[2:])) >= spacing - 0.02
@@ -0,0 +1,77 @@
+"""Tests for checks that answer verified domains with one breached-domain lookup."""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from dark_web_checker import BreachCatalog, DarkWebChecker, SlidingWindowLimiter
+
+
+class FakeResponse:
+    def __init__(self, status_code, body=None):
+        self.status_code = status_code
+        self.headers = {}
+        self.text = ''
+        self._body = body
+
+    def json(self):
+        return self._body
+
+
+class FakeSession:
+    """Knows one breached alias on company.com; every other address is clean."""
+
+    def __init__(self, consumed):
+        self.consumed = consumed
+        self.requests = []
+
+    def mount(self, prefix, adapter):
+        pass
+
+    def get(self, url, params=None, timeout=None):
+        self.requests.append((url.rsplit('/', 1)[-1], len(self.consumed)))
+        if '/breacheddomain/' in url:
+            return FakeResponse(200, {'jane': ['Adobe']})
+        return FakeResponse(404)
+
+
+def make_checker(consumed):
+    checker = DarkWebChecker("test-key", rate_limiter=SlidingWindowLimiter([(1, 0.001)]),
+                             catalog=BreachCatalog(path=None))
+    checker._session = FakeSession(consumed)
+    return checker
+
+
+def recorded(emails, consumed):
+    for email in emails:
+        consumed.append(email)
+        yield email
+
+
+def test_other_domains_are_checked_while_the_input_is_read():
+    consumed = []
+    checker = make_checker(consumed)
+    emails = ['a@other.com', 'jane@company.com', 'john@company.com', 'b@other.com']
+
+    results = {result['email']: result for result in
+               checker.check_many_by_domain(recorded(emails, consumed), ['company.com'], max_workers=1)}
+
+    assert {email: result['status'] for email, result in results.items()} == {
+        'a@other.com': 'clean', 'jane@company.com': 'found',
+        'john@company.com': 'clean', 'b@other.com': 'clean'}
+    assert results['jane@company.com']['breaches'] == ['Adobe']
+    # The first account was requested before the rest of the input was read
+    assert checker.session.requests[0] == ('a@other.com', 1)
+    assert [name for name, _ in checker.session.requests].count('company.com') == 1
+
+
+def test_long_runs_of_domain_addresses_are_all_answered_once():
+    consumed = []
+    checker = make_checker(consumed)
+    emails = [f'user{i}@company.com' for i in range(2500)] + ['a@other.com', 'b@other.com']
+
+    results = list(checker.check_many_by_domain(recorded(emails, consumed), ['company.com'], max_workers=4))
+
+    assert sorted(result['email'] for result in results) == sorted(emails)
+    assert [name for name, _ in checker.session.requests].count('company.com') == 1
@@ -0,0 +1,28 @@
+"""Regression tests for email address extraction from input files."""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from dark_web_checker import DarkWebChecker
+
+
+def test_non_ascii_local_part_is_not_truncated(tmp_path):
+    input_file = tmp_path / 'emails.txt'
+    input_file.write_text('jöhn@example.com\n'
+                          'müller.anna@firma.de\n'
+                          'name,email\nJane,jane@example.com\n', encoding='utf-8')
+
+    emails = list(DarkWebChecker("test-key").iter_emails_from_file(str(input_file)))
+
+    assert emails == ['jane@example.com']
+
+
+def test_non_ascii_after_address_is_not_truncated(tmp_path):
+    input_file = tmp_path / 'emails.txt'
+    input_file.write_text('john@example.comé\nanna@firma.de;ü\n', encoding='utf-8')
+
+    emails = list(DarkWebChecker("test-key").iter_emails_from_file(str(input_file)))
+
+    assert emails == ['anna@firma.de']
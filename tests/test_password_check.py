@@ -0,0 +1,28 @@
+"""Tests for the Pwned Passwords checker with hashed input."""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from dark_web_checker import PwnedPasswordsChecker, PwnedPasswordsIndex
+
+PWNED = '5BAA61E4C9B93F3F0682250B6CF8331B7EE68FD8'  # SHA-1 of "password"
+SAFE = '0000000000000000000000000000000000000001'
+
+
+def test_malformed_hashes_are_errors_not_safe(tmp_path):
+    source = tmp_path / 'pwned.txt'
+    source.write_text(f'{PWNED}:3730471\n', encoding='ascii')
+    index_path = str(tmp_path / 'pwned.idx')
+    PwnedPasswordsIndex.build(str(source), index_path)
+    index = PwnedPasswordsIndex(index_path)
+
+    try:
+        results = list(PwnedPasswordsChecker(index=index).check_hashes(
+            [PWNED.lower(), PWNED[:38], 'not-a-hash', SAFE]))
+    finally:
+        index.close()
+
+    statuses = {result['sha1']: result['status'] for result in results}
+    assert statuses == {PWNED: 'pwned', PWNED[:38]: 'error', 'NOT-A-HASH': 'error', SAFE: 'safe'}
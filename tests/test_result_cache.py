@@ -0,0 +1,25 @@
+"""Tests for the persistent result cache."""
+
+import os
+import sqlite3
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from dark_web_checker import ResultCache
+
+
+def test_cache_file_does_not_contain_the_address(tmp_path):
+    path = str(tmp_path / 'cache.db')
+    cache = ResultCache(path)
+    cache.put({'email': 'Jane@Example.com', 'status': 'clean', 'breach_count': 0, 'breaches': [],
+               'checked_at': '2024-01-15 10:30:45'})
+
+    cached = cache.get('jane@example.com')
+    cache.close()
+
+    assert cached['email'] == 'jane@example.com'
+    assert cached['status'] == 'clean' and cached['cached']
+    with sqlite3.connect(path) as conn:
+        payload, = conn.execute('SELECT result FROM results').fetchone()
+    assert 'example.com' not in payload.lower()
@@ -0,0 +1,55 @@
+"""Regression tests for resuming streamed result files after a crash."""
+
+import json
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from dark_web_checker import DarkWebChecker, ResultWriter
+
+
+def result(email, status):
+    return {'email': email, 'status': status, 'breach_count': 0, 'breaches': [],
+            'checked_at': '2024-01-15 10:30:45'}
+
+
+@pytest.mark.parametrize('extension', ['csv', 'jsonl'])
+def test_partial_last_line_is_dropped_on_resume(tmp_path, extension):
+    output_file = str(tmp_path / f'results.{extension}')
+    with ResultWriter(output_file) as writer:
+        writer.write(result('a@example.com', 'clean'))
+        writer.write(result('c@example.com', 'found'))
+    # Simulate a crash in the middle of the last row's checked_at field
+    with open(output_file, 'rb+') as f:
+        f.truncate(os.path.getsize(output_file) - 8)
+
+    assert ResultWriter.read_recorded_emails(output_file) == {'a@example.com'}
+
+    with ResultWriter(output_file, append=True) as writer:
+        writer.write(result('c@example.com', 'clean'))
+
+    with open(output_file, encoding='utf-8') as f:
+        content = f.read()
+    assert content.count('c@example.com') == 1
+    assert ResultWriter.read_recorded_emails(output_file) == {'a@example.com', 'c@example.com'}
+
+
+def test_merge_keeps_the_last_result_of_a_resumed_address(tmp_path):
+    output_file = str(tmp_path / 'results.jsonl')
+    with ResultWriter(output_file) as writer:
+        writer.write(result('a@example.com', 'clean'))
+        writer.write(result('b@example.com', 'error'))
+    # --resume re-checks the error and appends the new result
+    with ResultWriter(output_file, append=True) as writer:
+        writer.write(result('B@example.com', 'found'))
+
+    merged_file = str(tmp_path / 'merged.jsonl')
+    assert DarkWebChecker("test-key").merge_results([output_file], merged_file) == 2
+
+    with open(merged_file, encoding='utf-8') as f:
+        merged = [json.loads(line) for line in f]
+    assert [(row['email'], row['status']) for row in merged] == [
+        ('a@example.com', 'clean'), ('B@example.com', 'found')]